@@ -0,0 +1,249 @@
+"""
+Hiya Phone Number Scraper - Response Cache
+Stores the raw HTML of each page on disk so runs can be re-parsed offline
+"""
+
+import argparse
+import gzip
+import hashlib
+import json
+import os
+import re
+import time
+from html.parser import HTMLParser
+
+
+class ResponseCache:
+    """On-disk cache of page responses keyed by URL.
+
+    Each entry is a gzip-compressed JSON document holding the URL, the time
+    it was fetched, a content type and the raw content (page HTML, or JSON
+    for API responses). Entries older than ``ttl`` seconds are treated as
+    missing unless ``ignore_ttl`` is passed, which is what replay mode does.
+    With ``ttl=0`` nothing is ever fresh, so the cache only records pages.
+    """
+
+    def __init__(self, cache_dir="hiya_cache", ttl=24 * 60 * 60, compresslevel=6):
+        self.cache_dir = cache_dir
+        self.ttl = ttl
+        self.compresslevel = compresslevel
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def _path(self, url):
+        """Return the file path for a URL"""
+        key = hashlib.sha256(url.encode('utf-8')).hexdigest()
+        return os.path.join(self.cache_dir, key[:2], f"{key}.json.gz")
+
+    def _read(self, path):
+        try:
+            with gzip.open(path, 'rt', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _is_fresh(self, entry):
+        if self.ttl is None:
+            return True
+        if self.ttl == 0:
+            return False
+        return time.time() - entry.get('fetched_at', 0) <= self.ttl
+
+    def put(self, url, content, content_type="text/html"):
+        """Store the content fetched from a URL"""
+        path = self._path(url)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        entry = {
+            'url': url,
+            'fetched_at': time.time(),
+            'content_type': content_type,
+            'content': content,
+        }
+        # Write to a temp file first so a crash never leaves a truncated entry
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with gzip.open(tmp_path, 'wt', encoding='utf-8', compresslevel=self.compresslevel) as f:
+            json.dump(entry, f)
+        os.replace(tmp_path, path)
+
+    def get(self, url, ignore_ttl=False):
+        """Return the cached content for a URL, or None if missing or expired"""
+        entry = self._read(self._path(url))
+        if entry is None:
+            return None
+        if not ignore_ttl and not self._is_fresh(entry):
+            return None
+        return entry['content']
+
+    def entries(self):
+        """Yield every cached entry (including expired ones)"""
+        for root, dirs, files in os.walk(self.cache_dir):
+            for file in sorted(files):
+                if file.endswith('.json.gz'):
+                    entry = self._read(os.path.join(root, file))
+                    if entry is not None:
+                        yield entry
+
+    def prune(self):
+        """Delete expired entries and return how many were removed"""
+        removed = 0
+        for root, dirs, files in os.walk(self.cache_dir):
+            for file in files:
+                if not file.endswith('.json.gz'):
+                    continue
+                path = os.path.join(root, file)
+                entry = self._read(path)
+                if entry is None or not self._is_fresh(entry):
+                    os.remove(path)
+                    removed += 1
+        return removed
+
+
+class _PageParser(HTMLParser):
+    """Pull table rows and visible text out of a saved page.
+
+    Mirrors what the live scraper reads through Selenium: rows are
+    ``tbody tr`` elements (or ``[role='row']`` elements when there is no
+    table) and each cell's text has one line per block element.
+    """
+
+    BLOCK_TAGS = {'div', 'p', 'br', 'li', 'tr', 'td', 'th', 'table', 'section', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6'}
+    VOID_TAGS = {'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input', 'link', 'meta', 'source', 'track', 'wbr'}
+    SKIP_TAGS = {'script', 'style', 'noscript', 'template'}
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.stack = []
+        self.table_rows = []
+        self.role_rows = []
+        self.text_parts = []
+        self.row = None
+        self.cell = None
+        self.skip_depth = 0
+        self.tbody_depth = 0
+
+    def _break(self):
+        self.text_parts.append('\n')
+        if self.cell is not None:
+            self.cell.append('\n')
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        role = attrs.get('role')
+
+        if tag in self.BLOCK_TAGS:
+            self._break()
+        if tag in self.VOID_TAGS:
+            return
+
+        kind = None
+        if tag in self.SKIP_TAGS:
+            kind = 'skip'
+            self.skip_depth += 1
+        elif tag == 'tbody':
+            kind = 'tbody'
+            self.tbody_depth += 1
+        elif self.row is None and ((tag == 'tr' and self.tbody_depth) or role == 'row'):
+            kind = 'table_row' if tag == 'tr' and self.tbody_depth else 'role_row'
+            self.row = []
+        elif self.row is not None and self.cell is None and (tag == 'td' or role == 'cell'):
+            kind = 'cell'
+            self.cell = []
+
+        self.stack.append((tag, kind))
+
+    def handle_startendtag(self, tag, attrs):
+        if tag in self.BLOCK_TAGS:
+            self._break()
+
+    def handle_endtag(self, tag):
+        if tag in self.VOID_TAGS:
+            return
+        if not any(open_tag == tag for open_tag, _ in self.stack):
+            return
+        while self.stack:
+            open_tag, kind = self.stack.pop()
+            self._close(kind)
+            if open_tag == tag:
+                break
+        if tag in self.BLOCK_TAGS:
+            self._break()
+
+    def _close(self, kind):
+        if kind == 'skip':
+            self.skip_depth -= 1
+        elif kind == 'tbody':
+            self.tbody_depth -= 1
+        elif kind == 'cell':
+            self.row.append(_normalize_text(''.join(self.cell)))
+            self.cell = None
+        elif kind in ('table_row', 'role_row'):
+            if self.cell is not None:
+                self._close('cell')
+            if kind == 'table_row':
+                self.table_rows.append(self.row)
+            elif self.row:
+                # Header rows have no [role='cell'] children
+                self.role_rows.append(self.row)
+            self.row = None
+
+    def handle_data(self, data):
+        if self.skip_depth:
+            return
+        self.text_parts.append(data)
+        if self.cell is not None:
+            self.cell.append(data)
+
+
+def _normalize_text(text):
+    """Collapse whitespace the way a rendered element's .text does"""
+    lines = [re.sub(r'\s+', ' ', line).strip() for line in text.split('\n')]
+    return '\n'.join(line for line in lines if line)
+
+
+def parse_page(html):
+    """Parse saved page HTML.
+
+    Returns a ``(rows, text)`` tuple where ``rows`` is a list of cell-text
+    lists for each data row and ``text`` is the visible text of the page.
+    """
+    parser = _PageParser()
+    parser.feed(html)
+    parser.close()
+    rows = parser.table_rows or parser.role_rows
+    return rows, _normalize_text(''.join(parser.text_parts))
+
+
+def replay(cache_dir, filename=None, max_pages=None):
+    """Re-run scrape_all_pages entirely from the cache and save a CSV"""
+    from hiya_scraper import HiyaScraper
+
+    scraper = HiyaScraper(cache=ResponseCache(cache_dir, ttl=None), replay=True)
+    scraper.scrape_all_pages(max_pages=max_pages)
+    return scraper.save_to_csv(filename)
+
+
+def main():
+    """Command line entry point: replay or prune a cache directory"""
+    parser = argparse.ArgumentParser(description="Replay or prune a Hiya response cache")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    replay_parser = subparsers.add_parser('replay', help="Scrape every cached page offline and save a CSV")
+    replay_parser.add_argument('cache_dir', help="Response cache directory")
+    replay_parser.add_argument('output', nargs='?', help="CSV file to save to (default: timestamped name)")
+    replay_parser.add_argument('--max-pages', type=int, help="Stop after this many pages")
+
+    prune_parser = subparsers.add_parser('prune', help="Delete entries older than the TTL")
+    prune_parser.add_argument('cache_dir', help="Response cache directory")
+    prune_parser.add_argument('ttl', nargs='?', type=float, default=24 * 60 * 60,
+                              help="Maximum entry age in seconds (default: %(default).0f)")
+
+    args = parser.parse_args()
+
+    if args.command == 'replay':
+        replay(args.cache_dir, args.output, args.max_pages)
+    else:
+        removed = ResponseCache(args.cache_dir, ttl=args.ttl).prune()
+        print(f"🧹 Removed {removed} expired cache entries")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+"""
+Hiya Phone Number Scraper - Command Line
+One entry point for every tool. Each subcommand imports only its own module,
+so commands that work on existing exports or caches never load Selenium.
+"""
+
+import argparse
+import importlib
+import sys
+
+# Subcommand -> (module whose main() runs it, help text)
+COMMANDS = {
+    'scrape': ('hiya_scraper', "Log in and scrape every page (opens a browser)"),
+    'lookup': ('hiya_lookup', "Look up a list of phone numbers (opens browsers)"),
+    'shards': ('hiya_shards', "Plan, work on, inspect or merge a sharded export"),
+    'export': ('hiya_postprocess', "Normalize an exported CSV to typed CSV or Parquet"),
+    'diff': ('hiya_diff', "Compare two exports"),
+    'report': ('hiya_report', "Aggregate spam labeling and status per job and submitter"),
+    'cache': ('hiya_cache', "Replay or prune a response cache"),
+    'bench': ('hiya_selector_bench', "Benchmark row selectors against cached pages"),
+}
+
+
+def main():
+    """Dispatch to a subcommand, passing the remaining arguments through"""
+    parser = argparse.ArgumentParser(
+        description="Hiya Phone Number Scraper",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="commands:\n" + "\n".join(f"  {name:<8} {help_text}" for name, (_, help_text) in COMMANDS.items())
+              + "\n\nRun 'hiya_cli.py <command> --help' for a command's options.",
+    )
+    parser.add_argument('command', choices=COMMANDS, metavar='command', help="one of the commands below")
+    parser.add_argument('args', nargs=argparse.REMAINDER, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    module_name, _ = COMMANDS[args.command]
+    # The command's own parser reads sys.argv, so present it as '<prog> <command> ...'
+    sys.argv = [f"{parser.prog} {args.command}"] + args.args
+    importlib.import_module(module_name).main()
+
+
+if __name__ == "__main__":
+    main()
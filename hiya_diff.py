@@ -0,0 +1,99 @@
+"""
+Hiya Phone Number Scraper - Export Diff
+Compares two CSV exports and lists added, removed and changed phone numbers
+"""
+
+import argparse
+import csv
+
+from hiya_postprocess import number_key
+from hiya_scraper import FIELDNAMES
+
+# Columns compared between the two exports (phone_number is the key)
+COMPARED_COLUMNS = [name for name in FIELDNAMES if name != 'phone_number']
+
+
+def read_export_rows(path):
+    """Phone number key -> record for a raw or normalized export; the first record per number wins"""
+    rows = {}
+    with open(path, newline='', encoding='utf-8') as f:
+        for row in csv.DictReader(f):
+            key = number_key(row.get('phone_number') or '')
+            if key:
+                rows.setdefault(key, row)
+    return rows
+
+
+def diff_exports(old_path, new_path):
+    """Return {'added': [...], 'removed': [...], 'changed': [...]} between two exports.
+
+    ``changed`` entries hold the new record plus a ``changes`` dict of
+    column -> (old value, new value).
+    """
+    old = read_export_rows(old_path)
+    new = read_export_rows(new_path)
+
+    added = [new[key] for key in new if key not in old]
+    removed = [old[key] for key in old if key not in new]
+    changed = []
+    for key, record in new.items():
+        previous = old.get(key)
+        if previous is None:
+            continue
+        changes = {
+            column: (previous.get(column, ''), record.get(column, ''))
+            for column in COMPARED_COLUMNS
+            if column in previous and column in record and previous[column] != record[column]
+        }
+        if changes:
+            changed.append({'record': record, 'changes': changes})
+    return {'added': added, 'removed': removed, 'changed': changed}
+
+
+def print_diff(diff, limit=20):
+    """Print a summary of a diff, listing at most ``limit`` numbers per section"""
+    print(f"➕ Added:   {len(diff['added'])}")
+    for record in diff['added'][:limit]:
+        print(f"   {record['phone_number']}  {record.get('registration_status', '')}")
+    print(f"➖ Removed: {len(diff['removed'])}")
+    for record in diff['removed'][:limit]:
+        print(f"   {record['phone_number']}")
+    print(f"✏️  Changed: {len(diff['changed'])}")
+    for entry in diff['changed'][:limit]:
+        changes = ", ".join(f"{column}: {old!r} → {new!r}" for column, (old, new) in entry['changes'].items())
+        print(f"   {entry['record']['phone_number']}  {changes}")
+
+
+def save_diff(diff, filename):
+    """Write one row per added/removed number or changed column"""
+    with open(filename, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(['change', 'phone_number', 'column', 'old', 'new'])
+        for record in diff['added']:
+            writer.writerow(['added', record['phone_number'], '', '', ''])
+        for record in diff['removed']:
+            writer.writerow(['removed', record['phone_number'], '', '', ''])
+        for entry in diff['changed']:
+            for column, (old, new) in entry['changes'].items():
+                writer.writerow(['changed', entry['record']['phone_number'], column, old, new])
+    return filename
+
+
+def main():
+    """Compare two exports from the command line"""
+    parser = argparse.ArgumentParser(description="Compare two Hiya CSV exports")
+    parser.add_argument('old', help="Earlier export")
+    parser.add_argument('new', help="Later export")
+    parser.add_argument('-o', '--output', help="Write every change as a CSV row to this file")
+    parser.add_argument('--limit', type=int, default=20, help="Numbers to list per section")
+    args = parser.parse_args()
+
+    diff = diff_exports(args.old, args.new)
+    print_diff(diff, args.limit)
+    if args.output:
+        save_diff(diff, args.output)
+        print(f"✅ Saved changes to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,306 @@
+"""
+Hiya Phone Number Scraper - Shared Driver Pool
+Hands out Chrome sessions, health-checks them and recycles them to bound memory
+"""
+
+import os
+import signal
+import threading
+import time
+from urllib.parse import urlsplit
+
+try:
+    import psutil
+except ImportError:  # Optional: fall back to /proc on Linux
+    psutil = None
+
+
+def create_chrome_driver(headless=False, window_size="1920,1080"):
+    """Start Chrome, preferring a webdriver-manager managed ChromeDriver"""
+    from selenium import webdriver
+    from selenium.webdriver.chrome.options import Options
+    from selenium.webdriver.chrome.service import Service
+
+    chrome_options = Options()
+    if headless:
+        chrome_options.add_argument("--headless")
+    chrome_options.add_argument("--no-sandbox")
+    chrome_options.add_argument("--disable-dev-shm-usage")
+    # Keep background tabs rendering at full speed for pipelined prefetch
+    chrome_options.add_argument("--disable-background-timer-throttling")
+    chrome_options.add_argument("--disable-renderer-backgrounding")
+    chrome_options.add_argument("--disable-backgrounding-occluded-windows")
+    if window_size:
+        chrome_options.add_argument(f"--window-size={window_size}")
+
+    try:
+        from webdriver_manager.chrome import ChromeDriverManager
+        driver_path = ChromeDriverManager().install()
+
+        # Fix for Mac ARM: webdriver-manager sometimes returns wrong file path
+        if not driver_path.endswith('chromedriver'):
+            driver_dir = os.path.dirname(driver_path)
+            for root, dirs, files in os.walk(driver_dir):
+                for file in files:
+                    if file == 'chromedriver' and os.access(os.path.join(root, file), os.X_OK):
+                        driver_path = os.path.join(root, file)
+                        break
+
+        service = Service(driver_path)
+        return webdriver.Chrome(service=service, options=chrome_options)
+    except Exception as e:
+        print(f"webdriver-manager failed: {e}")
+        print("Trying to use system ChromeDriver...")
+        return webdriver.Chrome(options=chrome_options)
+
+
+def _proc_tree_pids(pid):
+    """A process and all of its descendants from /proc"""
+    pids = []
+    pending = [pid]
+    while pending:
+        current = pending.pop()
+        pids.append(current)
+        try:
+            tasks = os.listdir(f"/proc/{current}/task")
+        except OSError:
+            continue
+        for task in tasks:
+            try:
+                with open(f"/proc/{current}/task/{task}/children") as f:
+                    pending.extend(int(child) for child in f.read().split())
+            except OSError:
+                pass
+    return pids
+
+
+def _proc_rss(pid):
+    """RSS in bytes of a process and its descendants from /proc, or None"""
+    total = 0
+    for current in _proc_tree_pids(pid):
+        try:
+            with open(f"/proc/{current}/status") as f:
+                for line in f:
+                    if line.startswith('VmRSS:'):
+                        total += int(line.split()[1]) * 1024
+                        break
+        except OSError:
+            pass
+    return total or None
+
+
+def process_rss(pid):
+    """RSS in bytes of a single process, or None if unknown"""
+    if psutil is not None:
+        try:
+            return psutil.Process(pid).memory_info().rss
+        except psutil.Error:
+            return None
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return None
+
+
+def process_tree_rss(pid):
+    """RSS in bytes of a process plus all of its children, or None if unknown"""
+    if psutil is not None:
+        try:
+            process = psutil.Process(pid)
+            total = process.memory_info().rss
+            for child in process.children(recursive=True):
+                try:
+                    total += child.memory_info().rss
+                except psutil.Error:
+                    pass
+            return total
+        except psutil.Error:
+            return None
+    return _proc_rss(pid)
+
+
+def driver_rss(driver):
+    """RSS in bytes of ChromeDriver and the browser processes it started"""
+    service = getattr(driver, 'service', None)
+    process = getattr(service, 'process', None)
+    if process is None:
+        return None
+    return process_tree_rss(process.pid)
+
+
+def kill_driver(driver):
+    """Kill ChromeDriver and its browser processes so blocked WebDriver calls fail at once"""
+    service = getattr(driver, 'service', None)
+    process = getattr(service, 'process', None)
+    if process is None:
+        return False
+    if psutil is not None:
+        try:
+            children = psutil.Process(process.pid).children(recursive=True)
+        except psutil.Error:
+            children = []
+        for child in children:
+            try:
+                child.kill()
+            except psutil.Error:
+                pass
+    else:
+        for pid in _proc_tree_pids(process.pid)[1:]:
+            try:
+                os.kill(pid, signal.SIGKILL)
+            except OSError:
+                pass
+    process.kill()
+    return True
+
+
+class DriverSession:
+    """A pooled browser plus the bookkeeping used to decide when to recycle it"""
+
+    def __init__(self, driver):
+        self.driver = driver
+        self.pages = 0
+        self.created_at = time.time()
+
+
+class DriverPool:
+    """Hands out Chrome sessions shared by the scraper and its debug tools.
+
+    Sessions are health-checked with a cheap script ping when handed out and
+    recycled after ``max_pages`` pages or once the browser's RSS crosses
+    ``max_rss_mb``. Auth cookies and localStorage captured with
+    ``remember_auth`` are copied into every new or recycled browser, so a
+    long run keeps flat memory without logging in again.
+    """
+
+    def __init__(self, size=1, headless=False, window_size="1920,1080", max_pages=200, max_rss_mb=None):
+        self.size = size
+        self.headless = headless
+        self.window_size = window_size
+        self.max_pages = max_pages
+        self.max_rss_mb = max_rss_mb
+        self.idle = []
+        self.in_use = 0
+        self.condition = threading.Condition()
+        self.auth_origin = None
+        self.auth_cookies = []
+        self.auth_storage = {}
+
+    def _new_session(self):
+        session = DriverSession(create_chrome_driver(self.headless, self.window_size))
+        self._restore_auth(session.driver)
+        return session
+
+    def acquire(self):
+        """Return a healthy session, starting a browser if the pool has room"""
+        with self.condition:
+            while not self.idle and self.in_use >= self.size:
+                self.condition.wait()
+            session = self.idle.pop() if self.idle else None
+            self.in_use += 1
+
+        try:
+            if session is None:
+                return self._new_session()
+            if not self.is_healthy(session):
+                print("⚠️  Browser session failed health check - replacing it")
+                self._discard(session)
+                return self._new_session()
+            return session
+        except Exception:
+            with self.condition:
+                self.in_use -= 1
+                self.condition.notify()
+            raise
+
+    def release(self, session):
+        """Return a session to the pool for reuse"""
+        with self.condition:
+            self.in_use -= 1
+            self.idle.append(session)
+            self.condition.notify()
+
+    def is_healthy(self, session):
+        """Cheap ping: run a trivial script in the browser"""
+        try:
+            return session.driver.execute_script("return 1") == 1
+        except Exception:
+            return False
+
+    def remember_auth(self, session):
+        """Capture the cookies and localStorage of the session's current site"""
+        driver = session.driver
+        parts = urlsplit(driver.current_url)
+        if parts.scheme not in ('http', 'https'):
+            return
+        self.auth_origin = f"{parts.scheme}://{parts.netloc}"
+        self.auth_cookies = driver.get_cookies()
+        try:
+            self.auth_storage = driver.execute_script("return Object.assign({}, window.localStorage);") or {}
+        except Exception:
+            self.auth_storage = {}
+
+    def _restore_auth(self, driver):
+        if not self.auth_origin:
+            return
+        driver.get(self.auth_origin)
+        for cookie in self.auth_cookies:
+            try:
+                driver.add_cookie(cookie)
+            except Exception as e:
+                print(f"⚠️  Could not restore cookie {cookie.get('name')}: {e}")
+        for key, value in self.auth_storage.items():
+            driver.execute_script("window.localStorage.setItem(arguments[0], arguments[1]);", key, value)
+
+    def page_done(self, session):
+        """Count a scraped page and recycle the browser if it hit a limit
+
+        Returns the reason for recycling, or None if the browser was kept.
+        """
+        session.pages += 1
+        reason = None
+        if self.max_pages and session.pages >= self.max_pages:
+            reason = f"{session.pages} pages"
+        elif self.max_rss_mb:
+            rss = driver_rss(session.driver)
+            if rss is not None and rss > self.max_rss_mb * 1024 * 1024:
+                reason = f"{rss / (1024 * 1024):.0f} MB RSS"
+        if reason is None and self.is_healthy(session):
+            return None
+        reason = reason or "failed health check"
+        self.recycle(session, reason)
+        return reason
+
+    def recycle(self, session, reason="requested"):
+        """Replace the session's browser with a fresh one carrying the auth state"""
+        print(f"♻️  Recycling browser ({reason})")
+        if self.is_healthy(session):
+            try:
+                self.remember_auth(session)
+            except Exception as e:
+                print(f"⚠️  Could not capture auth state: {e}")
+        self._quit(session.driver)
+        session.driver = create_chrome_driver(self.headless, self.window_size)
+        session.pages = 0
+        session.created_at = time.time()
+        self._restore_auth(session.driver)
+
+    def _quit(self, driver):
+        try:
+            driver.quit()
+        except Exception:
+            pass
+
+    def _discard(self, session):
+        self._quit(session.driver)
+
+    def close(self):
+        """Quit every idle browser in the pool"""
+        with self.condition:
+            idle, self.idle = self.idle, []
+        for session in idle:
+            self._quit(session.driver)
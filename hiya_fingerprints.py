@@ -0,0 +1,77 @@
+"""
+Hiya Phone Number Scraper - Page Fingerprints
+Remembers a content hash and the parsed records of every page so unchanged
+pages can be reused on the next run instead of being parsed again
+"""
+
+import gzip
+import hashlib
+import json
+import os
+
+# Returns the rendered text of the data rows in one round trip
+FINGERPRINT_SCRIPT = """
+    var body = document.querySelector('table tbody');
+    if (body) { return body.innerText; }
+    return Array.prototype.map.call(
+        document.querySelectorAll("[role='row']"),
+        function (row) { return row.innerText; }
+    ).join('\\n');
+"""
+
+
+def page_fingerprint(driver):
+    """Hash of the current page's table text, read with a single script call
+
+    Returns None when the table has no text yet, so a page that hasn't
+    rendered is never matched against or stored.
+    """
+    text = driver.execute_script(FINGERPRINT_SCRIPT) or ""
+    if not text.strip():
+        return None
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+class FingerprintStore:
+    """Page URL -> fingerprint and records, kept between runs.
+
+    ``lookup`` returns the stored records when a page's fingerprint matches
+    the previous run; ``record`` saves the result of a fresh parse. Entries
+    carry the ``version`` of the parser that produced them (row strategy
+    and parser version), and entries from another version are ignored.
+    Pages not visited in this run keep their old entry when the store is
+    saved.
+    """
+
+    def __init__(self, path="hiya_fingerprints.json.gz"):
+        self.path = path
+        self.pages = {}
+        self.reused = 0
+        self.changed = 0
+        if os.path.exists(path):
+            try:
+                with gzip.open(path, 'rt', encoding='utf-8') as f:
+                    self.pages = json.load(f)
+            except (OSError, ValueError) as e:
+                print(f"⚠️  Ignoring unreadable fingerprint store {path}: {e}")
+
+    def lookup(self, url, fingerprint, version):
+        """Return the previous run's records for an unchanged page, or None"""
+        entry = self.pages.get(url)
+        if entry is None or entry['fingerprint'] != fingerprint or entry.get('version') != version:
+            self.changed += 1
+            return None
+        self.reused += 1
+        return [dict(record) for record in entry['records']]
+
+    def record(self, url, fingerprint, records, version):
+        """Store a freshly parsed page"""
+        self.pages[url] = {'fingerprint': fingerprint, 'version': version, 'records': records}
+
+    def save(self):
+        """Write the store to disk"""
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with gzip.open(tmp_path, 'wt', encoding='utf-8') as f:
+            json.dump(self.pages, f)
+        os.replace(tmp_path, self.path)
+        print(f"🔖 Fingerprints: {self.reused} pages unchanged, {self.changed} parsed ({self.path})")
@@ -0,0 +1,225 @@
+"""
+Hiya Phone Number Scraper - Bulk Lookup
+Checks the current status of a list of phone numbers through the dashboard's
+search parameter instead of crawling the whole account
+"""
+
+import argparse
+import csv
+import os
+import queue
+import sys
+import threading
+import time
+from datetime import datetime
+
+from hiya_driver_pool import DriverPool
+from hiya_postprocess import number_key
+from hiya_rate_control import AdaptiveLimiter
+from hiya_scraper import FIELDNAMES, HiyaScraper
+
+# Results per search page (the size= parameter of get_page_url)
+PAGE_SIZE = 100
+
+
+def read_numbers(path):
+    """Read phone numbers from a text file or the first column of a CSV.
+
+    Blank lines, '#' comments, header cells without digits and duplicate
+    numbers are skipped.
+    """
+    numbers = []
+    seen = set()
+    with open(path, newline='', encoding='utf-8') as f:
+        for row in csv.reader(f):
+            if not row or row[0].strip().startswith('#'):
+                continue
+            number = row[0].strip()
+            key = number_key(number)
+            if not key or key in seen:
+                continue
+            seen.add(key)
+            numbers.append(number)
+    return numbers
+
+
+class BulkLookup:
+    """Look up numbers with several logged-in browsers in parallel.
+
+    Numbers are grouped into batches of ``batch_size`` joined by
+    ``separator`` in a single ``search=`` query. A batch that comes back
+    with no matches is retried one number at a time; if that finds
+    anything, the server doesn't support multi-number search and batching
+    is switched off for the rest of the run.
+
+    When a search raises, the scraper's browser is recycled and the batch
+    goes back on the queue for whichever session is free next. A scraper
+    whose browser can't be replaced is retired. Numbers still failing after
+    ``max_attempts`` searches are reported as failed, not as missing.
+    """
+
+    def __init__(self, scrapers, batch_size=1, separator=",", max_attempts=3):
+        self.scrapers = scrapers
+        self.batch_size = max(1, min(batch_size, PAGE_SIZE))
+        self.separator = separator
+        self.max_attempts = max_attempts
+        self.batching = self.batch_size > 1
+        self.found = {}
+        self.failed = []
+        self.lock = threading.Lock()
+
+    def _search(self, scraper, numbers):
+        """Run one search and return the records matching the requested numbers"""
+        wanted = {number_key(number) for number in numbers}
+        scraper.filters = {'search': self.separator.join(numbers)}
+        scraper.data = []
+        scraper.navigate_to_page(0)
+        scraper.scrape_current_page()
+        return [record for record in scraper.data if number_key(record['phone_number']) in wanted]
+
+    def _lookup_batch(self, scraper, batch):
+        records = self._search(scraper, batch)
+        if len(batch) > 1 and not records:
+            records = [record for number in batch for record in self._search(scraper, [number])]
+            if records and self.batching:
+                print("⚠️  Batched search isn't supported - searching one number at a time")
+                self.batching = False
+
+        with self.lock:
+            for record in records:
+                self.found.setdefault(number_key(record['phone_number']), []).append(record)
+
+    def _worker(self, scraper, batches):
+        while True:
+            try:
+                batch, attempts = batches.get_nowait()
+            except queue.Empty:
+                return
+            try:
+                if not self.batching and len(batch) > 1:
+                    for number in batch:
+                        batches.put(([number], attempts))
+                    continue
+                self._lookup_batch(scraper, batch)
+            except Exception as e:
+                attempts += 1
+                print(f"❌ Lookup failed for {batch} (attempt {attempts}/{self.max_attempts}): {e}")
+                if attempts < self.max_attempts:
+                    batches.put((batch, attempts))
+                else:
+                    with self.lock:
+                        self.failed.extend(batch)
+                if scraper.session is None:
+                    continue
+                try:
+                    scraper.pool.recycle(scraper.session, "lookup failed")
+                except Exception as e:
+                    print(f"❌ Could not restart the browser - retiring this session: {e}")
+                    return
+
+    def run(self, numbers):
+        """Look up every number; returns (records, missing numbers, failed numbers)"""
+        batches = queue.Queue()
+        for start in range(0, len(numbers), self.batch_size):
+            batches.put((numbers[start:start + self.batch_size], 0))
+
+        threads = [threading.Thread(target=self._worker, args=(scraper, batches), daemon=True)
+                   for scraper in self.scrapers]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        # Batches left over when every session was retired
+        while not batches.empty():
+            self.failed.extend(batches.get_nowait()[0])
+
+        failed = {number_key(number) for number in self.failed}
+        records = []
+        missing = []
+        for number in numbers:
+            matches = self.found.get(number_key(number))
+            if matches:
+                records.extend(matches)
+            elif number_key(number) not in failed:
+                missing.append(number)
+        return records, missing, [number for number in numbers if number_key(number) in failed]
+
+
+def save_records(records, filename):
+    """Write looked-up records to CSV"""
+    with open(filename, 'w', newline='', encoding='utf-8') as csvfile:
+        writer = csv.DictWriter(csvfile, fieldnames=FIELDNAMES)
+        writer.writeheader()
+        writer.writerows(records)
+    return filename
+
+
+def save_numbers(numbers, filename):
+    """Write one number per line, in the format read_numbers reads back"""
+    with open(filename, 'w', encoding='utf-8') as f:
+        f.writelines(f"{number}\n" for number in numbers)
+    return filename
+
+
+def main():
+    """Look up a file of phone numbers and save only their records"""
+    parser = argparse.ArgumentParser(description="Look up specific phone numbers on the Hiya dashboard")
+    parser.add_argument('numbers', help="Text or CSV file with one phone number per line")
+    parser.add_argument('-o', '--output', help="CSV file for the matching records")
+    parser.add_argument('--sessions', type=int, default=3, help="Browsers to search with in parallel")
+    parser.add_argument('--batch-size', type=int, default=1, help="Numbers per search query")
+    parser.add_argument('--separator', default=",", help="Separator between numbers in a batched search")
+    parser.add_argument('--headless', action='store_true')
+    args = parser.parse_args()
+
+    numbers = read_numbers(args.numbers)
+    if not numbers:
+        print("❌ No phone numbers found in the input file")
+        sys.exit(1)
+    output = args.output or f"hiya_lookup_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
+
+    print("="*60)
+    print(f"Hiya Bulk Lookup: {len(numbers)} numbers, {args.sessions} sessions")
+    print("="*60)
+
+    username = os.environ.get('HIYA_USERNAME') or input("Enter your Hiya username/email: ")
+    password = os.environ.get('HIYA_PASSWORD') or input("Enter your Hiya password: ")
+
+    pool = DriverPool(size=args.sessions, headless=args.headless)
+    limiter = AdaptiveLimiter(max_limit=args.sessions)
+    scrapers = [HiyaScraper(pool=pool, limiter=limiter)]
+
+    try:
+        scrapers[0].login(username, password)
+        print("\n🔐 If you have 2FA enabled, please complete it now...")
+        print("Press Enter once you're logged in and ready to continue...")
+        input()
+
+        # Capture auth on the dashboard so the other browsers start logged in
+        scrapers[0].navigate_to_page(0)
+        scrapers[0].remember_auth()
+        scrapers.extend(HiyaScraper(pool=pool, limiter=limiter) for _ in range(args.sessions - 1))
+
+        start = time.monotonic()
+        records, missing, failed = BulkLookup(scrapers, args.batch_size, args.separator).run(numbers)
+        elapsed = time.monotonic() - start
+
+        save_records(records, output)
+        found = len(numbers) - len(missing) - len(failed)
+        print(f"\n✅ Found {found} of {len(numbers)} numbers in {elapsed:.1f}s")
+        print(f"💾 Saved {len(records)} records to {output}")
+        if missing:
+            print(f"⚠️  Not found: {', '.join(missing)}")
+        if failed:
+            failed_file = save_numbers(failed, os.path.splitext(output)[0] + "_failed.txt")
+            print(f"❌ {len(failed)} numbers could not be looked up - saved to {failed_file} to retry")
+    finally:
+        for scraper in scrapers:
+            scraper.close()
+        pool.close()
+        print("Browsers closed")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+"""
+Hiya Phone Number Scraper - Memory Profiling
+Per-page tracemalloc snapshots and process RSS for Python and the browser
+"""
+
+import json
+import os
+import tracemalloc
+
+from hiya_driver_pool import driver_rss, process_rss
+
+MB = 1024 * 1024
+
+
+def _mb(value):
+    return "n/a" if value is None else f"{value} MB"
+
+
+class MemoryBudgetExceeded(Exception):
+    """Raised when a profiled run uses more memory than its budget"""
+
+
+class MemoryProfiler:
+    """Opt-in memory profiler for scrape_all_pages.
+
+    After each page it records Python's traced allocations, the scraper
+    process RSS and the RSS of ChromeDriver plus its browser processes,
+    then prints the allocation sites that grew the most since the previous
+    page. Comparing the three growth figures tells whether ``self.data``,
+    leftover WebElement references or the browser itself is swelling.
+    Exceeding ``budget_mb`` (Python RSS plus browser RSS) raises
+    MemoryBudgetExceeded.
+    """
+
+    def __init__(self, budget_mb=None, top=5, frames=1):
+        self.budget_mb = budget_mb
+        self.top = top
+        self.frames = frames
+        self.pages = []
+        self.first_snapshot = None
+        self.last_snapshot = None
+        self.started_tracing = False
+
+    def _snapshot(self):
+        return tracemalloc.take_snapshot().filter_traces([
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+        ])
+
+    def start(self):
+        """Start tracing allocations"""
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.frames)
+            self.started_tracing = True
+        self.pages = []
+        self.first_snapshot = self.last_snapshot = self._snapshot()
+
+    def stop(self):
+        """Stop tracing if this profiler started it"""
+        if self.started_tracing:
+            tracemalloc.stop()
+            self.started_tracing = False
+
+    def page_done(self, page_num, driver=None, records=None):
+        """Record memory after a page and enforce the budget"""
+        snapshot = self._snapshot()
+        traced, peak = tracemalloc.get_traced_memory()
+        python_rss = process_rss(os.getpid())
+        browser_rss = driver_rss(driver) if driver is not None else None
+        total = (python_rss or traced) + (browser_rss or 0)
+
+        previous = self.pages[-1] if self.pages else None
+        sample = {
+            'page': page_num + 1,
+            'records': records,
+            'traced_mb': round(traced / MB, 2),
+            'python_rss_mb': round(python_rss / MB, 2) if python_rss is not None else None,
+            'browser_rss_mb': round(browser_rss / MB, 2) if browser_rss is not None else None,
+            'total_mb': round(total / MB, 2),
+            'growth_mb': round(total / MB - previous['total_mb'], 2) if previous else 0.0,
+            'recycled': None,
+        }
+        self.pages.append(sample)
+
+        print(f"🧠 Memory: python traced {_mb(sample['traced_mb'])}, "
+              f"python RSS {_mb(sample['python_rss_mb'])}, browser RSS {_mb(sample['browser_rss_mb'])} "
+              f"({sample['growth_mb']:+} MB since last page)")
+        for stat in snapshot.compare_to(self.last_snapshot, 'lineno')[:self.top]:
+            if stat.size_diff > 0:
+                print(f"   {stat.size_diff / 1024:+.1f} KiB  {stat.traceback}")
+        self.last_snapshot = snapshot
+
+        if self.budget_mb and total > self.budget_mb * MB:
+            self.report()
+            self.stop()
+            raise MemoryBudgetExceeded(
+                f"Using {total / MB:.0f} MB after page {page_num + 1}, budget is {self.budget_mb} MB"
+            )
+
+    def browser_recycled(self, reason):
+        """Note that the browser was replaced after the latest sample"""
+        if self.pages:
+            self.pages[-1]['recycled'] = reason
+        print(f"🧠 Browser recycled ({reason}); the next sample starts from a fresh browser")
+
+    def _browser_growth_per_page(self):
+        """Browser RSS growth per page, leaving out the drops at recycles"""
+        growth = 0.0
+        steps = 0
+        for previous, sample in zip(self.pages, self.pages[1:]):
+            if previous['recycled'] or previous['browser_rss_mb'] is None or sample['browser_rss_mb'] is None:
+                continue
+            growth += sample['browser_rss_mb'] - previous['browser_rss_mb']
+            steps += 1
+        return growth / steps if steps else 0.0
+
+    def report(self):
+        """Print growth per page and the top allocation sites since the start"""
+        if not self.pages:
+            return
+        print(f"\n{'='*60}")
+        print("MEMORY PROFILE")
+        print(f"{'='*60}")
+
+        first, last = self.pages[0], self.pages[-1]
+        steps = max(len(self.pages) - 1, 1)
+        for key, label in (('traced_mb', "Python traced"), ('python_rss_mb', "Python RSS"),
+                           ('browser_rss_mb', "Browser RSS")):
+            if first[key] is None or last[key] is None:
+                continue
+            if key == 'browser_rss_mb':
+                per_page = self._browser_growth_per_page()
+            else:
+                per_page = (last[key] - first[key]) / steps
+            print(f"{label:<14} {first[key]:>9.1f} → {last[key]:>9.1f} MB  ({per_page:+.2f} MB/page)")
+
+        recycled_after = [str(sample['page']) for sample in self.pages if sample['recycled']]
+        if recycled_after:
+            peak = max(sample['browser_rss_mb'] or 0 for sample in self.pages)
+            print(f"Browser recycled {len(recycled_after)} times (after pages {', '.join(recycled_after)}); "
+                  f"peak browser RSS {peak:.1f} MB")
+
+        if self.last_snapshot is not None and self.first_snapshot is not None:
+            print("\nTop allocation sites since the start of the run:")
+            for stat in self.last_snapshot.compare_to(self.first_snapshot, 'lineno')[:self.top]:
+                print(f"   {stat.size_diff / 1024:+.1f} KiB ({stat.count_diff:+} blocks)  {stat.traceback}")
+
+    def save(self, path):
+        """Write the per-page samples as JSON"""
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({'budget_mb': self.budget_mb, 'pages': self.pages}, f, indent=2)
+        return path
@@ -0,0 +1,161 @@
+"""
+Hiya Phone Number Scraper - Post-processing
+Turns scraped display strings into typed columns with vectorized pandas operations
+"""
+
+import argparse
+import re
+import sys
+
+from hiya_scraper import FIELDNAMES
+
+# Display formats seen in the "Submitted" column, tried in order
+SUBMITTED_DATE_FORMATS = [
+    "%b %d, %Y %I:%M %p",
+    "%b %d, %Y",
+    "%m/%d/%Y %I:%M %p",
+    "%m/%d/%Y",
+    "%Y-%m-%d %H:%M:%S",
+    "%Y-%m-%d",
+]
+
+# Label columns stored as pandas categoricals
+CATEGORICAL_COLUMNS = [
+    'submitted_by',
+    'registration_job_name',
+    'branded_call',
+    'spam_labeling',
+    'spam_category',
+    'registration_status',
+]
+
+NORMALIZED_COLUMNS = ['phone_number', 'phone_display', 'submitted_at'] + CATEGORICAL_COLUMNS
+
+ISO_FORMAT = "%Y-%m-%dT%H:%M:%S"
+
+
+def number_key(number):
+    """Comparable key for one phone number: its digits, with a 1 added to 10-digit numbers"""
+    digits = re.sub(r'\D', '', number)
+    if len(digits) == 10:
+        digits = '1' + digits
+    return digits
+
+
+def to_e164(phones):
+    """Convert a Series of display phone numbers (e.g. '+1 213 731 2373') to E.164.
+
+    Numbers written with a leading '+' keep their country code; bare
+    10-digit numbers are treated as North American. Anything else becomes NA.
+    """
+    phones = phones.str.strip()
+    digits = phones.str.replace(r'\D', '', regex=True)
+    lengths = digits.str.len()
+    explicit = phones.str.startswith('+')
+
+    international = explicit & lengths.between(8, 15)
+    trunk = ~explicit & (lengths == 11) & digits.str.startswith('1')
+    national = ~explicit & (lengths == 10)
+
+    national_e164 = ('+1' + digits).where(national)
+    return ('+' + digits).where(international | trunk, national_e164).astype('string')
+
+
+def parse_submitted_dates(values):
+    """Parse a Series of 'Submitted' display dates into datetimes (NaT if unknown)"""
+    import pandas as pd
+
+    if values.empty:
+        return pd.Series(pd.NaT, index=values.index, dtype='datetime64[ns]')
+
+    # Exports repeat the same few dates many times; parse each one once
+    values = values.str.strip()
+    uniques = pd.Series(values.unique())
+    parsed = pd.Series(pd.NaT, index=uniques.index, dtype='datetime64[ns]')
+    for fmt in SUBMITTED_DATE_FORMATS:
+        missing = parsed.isna() & uniques.ne('')
+        if not missing.any():
+            break
+        parsed[missing] = pd.to_datetime(uniques[missing], format=fmt, errors='coerce')
+
+    parsed.index = uniques
+    return values.map(parsed)
+
+
+def normalize_frame(frame):
+    """Return a typed copy of a frame of raw scraped records.
+
+    Produces E.164 ``phone_number`` (the original kept as ``phone_display``),
+    a ``submitted_at`` datetime and categorical label columns, with the
+    submitter email lower-cased. Every step works on whole columns, so a
+    page or a full run costs about the same per row.
+    """
+    import pandas as pd
+
+    text = frame.reindex(columns=FIELDNAMES).fillna('').astype(str)
+    text = text.apply(lambda column: column.str.strip())
+
+    normalized = pd.DataFrame(index=text.index)
+    normalized['phone_number'] = to_e164(text['phone_number'])
+    normalized['phone_display'] = text['phone_number'].astype('string')
+    normalized['submitted_at'] = parse_submitted_dates(text['submitted_date'])
+
+    text['submitted_by'] = text['submitted_by'].str.lower()
+    for column in CATEGORICAL_COLUMNS:
+        normalized[column] = text[column].replace('', pd.NA).astype('category')
+
+    unparsed = normalized['submitted_at'].isna() & text['submitted_date'].ne('')
+    if unparsed.any():
+        print(f"⚠️  Could not parse {int(unparsed.sum())} submitted dates, "
+              f"e.g. {text.loc[unparsed, 'submitted_date'].iloc[0]!r}")
+
+    return normalized[NORMALIZED_COLUMNS]
+
+
+def normalize_records(records):
+    """Normalize a list of record dicts (one page or a whole run)"""
+    import pandas as pd
+
+    return normalize_frame(pd.DataFrame.from_records(records, columns=FIELDNAMES))
+
+
+def read_export(path):
+    """Read a scraper CSV with every column kept as text"""
+    import pandas as pd
+
+    return pd.read_csv(path, dtype=str, keep_default_na=False)
+
+
+def write_normalized(frame, path):
+    """Write a normalized frame as CSV (ISO timestamps) or Parquet (needs pyarrow)"""
+    if path.endswith('.parquet'):
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            raise ImportError("Parquet output needs pyarrow: pip install pyarrow") from None
+        frame.to_parquet(path, index=False)
+    else:
+        frame.to_csv(path, index=False, date_format=ISO_FORMAT)
+    return path
+
+
+def main():
+    """Normalize an exported CSV: python hiya_postprocess.py input.csv [output.csv|output.parquet]"""
+    parser = argparse.ArgumentParser(description="Normalize a Hiya CSV export into typed columns")
+    parser.add_argument('source', help="Exported CSV")
+    parser.add_argument('target', nargs='?', help="Output .csv or .parquet (default: <source>_normalized.csv)")
+    args = parser.parse_args()
+
+    target = args.target or args.source.rsplit('.', 1)[0] + '_normalized.csv'
+
+    frame = normalize_frame(read_export(args.source))
+    try:
+        write_normalized(frame, target)
+    except ImportError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+    print(f"✅ Normalized {len(frame)} records into {target}")
+
+
+if __name__ == "__main__":
+    main()
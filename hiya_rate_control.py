@@ -0,0 +1,126 @@
+"""
+Hiya Phone Number Scraper - Adaptive Rate Control
+AIMD controller for page concurrency and pacing, driven by latency and errors
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+
+
+class SlotOutcome:
+    """Set ``error`` inside a slot to report a failed request"""
+
+    def __init__(self):
+        self.error = None
+
+
+class AdaptiveLimiter:
+    """Additive-increase / multiplicative-decrease request controller.
+
+    Callers take a slot before every page load or HTTP fetch and report how
+    long it took. While latency stays within ``latency_tolerance`` times the
+    running baseline, the concurrency limit grows by about one per window of
+    requests and the delay between request starts shrinks. A throttle
+    response (429), timeout or empty page cuts the limit by ``decrease`` and
+    doubles the delay. ``metrics()`` exposes the current state.
+    """
+
+    def __init__(self, initial_limit=1, min_limit=1, max_limit=8, decrease=0.5,
+                 latency_tolerance=1.5, min_interval=0.0, max_interval=60.0,
+                 backoff_interval=2.0, interval_step=0.5):
+        self.limit = float(initial_limit)
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.decrease = decrease
+        self.latency_tolerance = latency_tolerance
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.backoff_interval = backoff_interval
+        self.interval_step = interval_step
+        self.interval = min_interval
+        self.baseline = None
+        self.last_latency = None
+        self.in_flight = 0
+        self.successes = 0
+        self.failures = 0
+        self.next_start = 0.0
+        self.condition = threading.Condition()
+
+    def acquire(self):
+        """Block until a slot is free and the pacing delay has passed"""
+        with self.condition:
+            while self.in_flight >= max(1, int(self.limit)):
+                self.condition.wait()
+            self.in_flight += 1
+            now = time.monotonic()
+            start_at = max(now, self.next_start)
+            self.next_start = start_at + self.interval
+        if start_at > now:
+            time.sleep(start_at - now)
+
+    def release(self, latency, error=None):
+        """Free a slot and feed its latency (or error) into the controller
+
+        Pass ``latency=None`` without an error to free a slot whose request
+        was abandoned, without affecting the limits.
+        """
+        with self.condition:
+            self.in_flight -= 1
+            if error:
+                self._backoff(error)
+            elif latency is not None:
+                self._record_success(latency)
+            self.condition.notify_all()
+
+    def backoff(self, reason):
+        """Report a failure noticed after the slot was released (e.g. an empty page)"""
+        with self.condition:
+            self._backoff(reason)
+            self.condition.notify_all()
+
+    @contextmanager
+    def slot(self):
+        """Hold a slot for one request, timing it and reporting exceptions as errors"""
+        self.acquire()
+        outcome = SlotOutcome()
+        start = time.monotonic()
+        try:
+            yield outcome
+        except Exception as e:
+            outcome.error = outcome.error or type(e).__name__
+            raise
+        finally:
+            self.release(time.monotonic() - start, outcome.error)
+
+    def _record_success(self, latency):
+        self.successes += 1
+        self.last_latency = latency
+        if self.baseline is None:
+            self.baseline = latency
+        flat = latency <= self.baseline * self.latency_tolerance
+        self.baseline = 0.9 * self.baseline + 0.1 * latency
+        if flat:
+            self.limit = min(self.max_limit, self.limit + 1.0 / max(self.limit, 1.0))
+            self.interval = max(self.min_interval, self.interval - self.interval_step)
+
+    def _backoff(self, reason):
+        self.failures += 1
+        old_limit = self.limit
+        self.limit = max(self.min_limit, self.limit * self.decrease)
+        self.interval = min(self.max_interval, max(self.interval * 2, self.backoff_interval))
+        print(f"🐢 Backing off ({reason}): limit {old_limit:.1f} → {self.limit:.1f}, "
+              f"delay {self.interval:.1f}s between requests")
+
+    def metrics(self):
+        """Current controller state for progress output or monitoring"""
+        with self.condition:
+            return {
+                'limit': int(self.limit),
+                'in_flight': self.in_flight,
+                'interval_s': round(self.interval, 2),
+                'latency_s': round(self.last_latency, 2) if self.last_latency is not None else None,
+                'baseline_s': round(self.baseline, 2) if self.baseline is not None else None,
+                'successes': self.successes,
+                'failures': self.failures,
+            }
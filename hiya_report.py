@@ -0,0 +1,171 @@
+"""
+Hiya Phone Number Scraper - Aggregate Report
+Spam-labeling and registration-status breakdowns per job and per submitter,
+computed in a single streaming pass over the scraper's outputs
+"""
+
+import argparse
+import csv
+import gzip
+import json
+import os
+import time
+from collections import Counter
+from itertools import chain
+from operator import itemgetter
+
+GROUP_COLUMNS = ['registration_job_name', 'submitted_by']
+MEASURE_COLUMNS = ['spam_labeling', 'registration_status']
+
+BLANK = "(blank)"
+
+
+def _open_text(path):
+    if path.endswith('.gz'):
+        return gzip.open(path, 'rt', newline='', encoding='utf-8')
+    return open(path, newline='', encoding='utf-8')
+
+
+def iter_csv_rows(path):
+    """Yield (job, submitter, spam_labeling, registration_status) from a raw or normalized CSV"""
+    with _open_text(path) as f:
+        reader = csv.reader(f)
+        header = next(reader, None)
+        if header is None:
+            return
+        try:
+            indexes = [header.index(column) for column in GROUP_COLUMNS + MEASURE_COLUMNS]
+        except ValueError as e:
+            raise ValueError(f"{path} is not a scraper export: {e}")
+        get = itemgetter(*indexes)
+        padding = [''] * len(header)
+        for row in reader:
+            try:
+                yield get(row)
+            except IndexError:
+                # Truncated line, e.g. the end of a partial export: pad the missing cells
+                if row:
+                    yield get(row + padding)
+
+
+def iter_cache_rows(cache_dir):
+    """Yield the same tuples from the pages stored in a response cache
+
+    Listing, shard and lookup pages overlap, so each phone number is
+    counted once, from the most recently fetched page that shows it.
+    """
+    from hiya_cache import ResponseCache, parse_page
+    from hiya_scraper import parse_row_cells
+
+    columns = GROUP_COLUMNS + MEASURE_COLUMNS
+    latest = {}
+    for entry in ResponseCache(cache_dir, ttl=None).entries():
+        fetched_at = entry.get('fetched_at', 0)
+        rows, text = parse_page(entry['content'])
+        for cell_texts in rows:
+            record = parse_row_cells(cell_texts)
+            if record is None:
+                continue
+            previous = latest.get(record['phone_number'])
+            if previous is None or previous[0] < fetched_at:
+                latest[record['phone_number']] = (fetched_at, tuple(record[column] for column in columns))
+    for fetched_at, row in latest.values():
+        yield row
+
+
+def iter_rows(path):
+    """Pick a reader for a CSV, gzipped CSV or response cache directory"""
+    if os.path.isdir(path):
+        return iter_cache_rows(path)
+    return iter_csv_rows(path)
+
+
+def build_report(rows):
+    """Aggregate rows in one pass.
+
+    Identical rows are counted first (Counter does this in C), then each
+    distinct combination is fanned out into the group-by counts. Exports
+    have few distinct combinations, so the Python-level work and memory
+    grow with the number of groups and not with the number of rows.
+    """
+    totals = Counter()
+    counts = Counter()
+    combinations = Counter(rows)
+    records = sum(combinations.values())
+
+    for (job, submitter, spam_labeling, status), n in combinations.items():
+        job = job.strip() or BLANK
+        submitter = submitter.strip().lower() or BLANK
+        spam_labeling = spam_labeling.strip() or BLANK
+        status = status.strip() or BLANK
+        totals['spam_labeling', spam_labeling] += n
+        totals['registration_status', status] += n
+        counts['registration_job_name', job, 'spam_labeling', spam_labeling] += n
+        counts['registration_job_name', job, 'registration_status', status] += n
+        counts['submitted_by', submitter, 'spam_labeling', spam_labeling] += n
+        counts['submitted_by', submitter, 'registration_status', status] += n
+
+    report = {
+        'records': records,
+        'totals': {measure: {} for measure in MEASURE_COLUMNS},
+        'by_registration_job_name': {},
+        'by_submitted_by': {},
+    }
+    for (measure, value), count in sorted(totals.items()):
+        report['totals'][measure][value] = count
+
+    for (group_column, group, measure, value), count in sorted(counts.items()):
+        groups = report[f"by_{group_column}"]
+        summary = groups.setdefault(group, {'records': 0, **{m: {} for m in MEASURE_COLUMNS}})
+        summary[measure][value] = count
+        if measure == MEASURE_COLUMNS[0]:
+            summary['records'] += count
+
+    return report
+
+
+def print_report(report):
+    """Print a compact text version of a report"""
+    print(f"📊 {report['records']} records")
+    for measure, values in report['totals'].items():
+        print(f"\n{measure}:")
+        for value, count in sorted(values.items(), key=lambda item: -item[1]):
+            print(f"   {value:<40} {count:>8}")
+
+    for key, title in (('by_registration_job_name', "Registration job"), ('by_submitted_by', "Submitter")):
+        print(f"\n{'='*60}")
+        print(f"BY {title.upper()}")
+        print(f"{'='*60}")
+        for group, summary in sorted(report[key].items(), key=lambda item: -item[1]['records']):
+            labels = ", ".join(f"{v}: {c}" for v, c in summary['spam_labeling'].items())
+            statuses = ", ".join(f"{v}: {c}" for v, c in summary['registration_status'].items())
+            print(f"{group} ({summary['records']})")
+            print(f"   spam labeling: {labels}")
+            print(f"   status:        {statuses}")
+
+
+def main():
+    """Build a report from one or more scraper outputs"""
+    parser = argparse.ArgumentParser(description="Aggregate Hiya scraper outputs")
+    parser.add_argument('inputs', nargs='+', help="CSV exports (optionally .gz) or response cache directories")
+    parser.add_argument('-o', '--output', help="Write the summary as JSON to this file")
+    parser.add_argument('--quiet', action='store_true', help="Don't print the text summary")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    rows = chain.from_iterable(map(iter_rows, args.inputs))
+    report = build_report(rows)
+    elapsed = time.perf_counter() - start
+
+    if not args.quiet:
+        print_report(report)
+    print(f"\n⏱️  Aggregated {report['records']} records in {elapsed:.2f}s")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=1, ensure_ascii=False)
+        print(f"✅ Saved summary to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
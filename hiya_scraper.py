@@ -3,52 +3,278 @@ Hiya Phone Number Scraper - URL Navigation Version
 Navigates directly to each page using URL parameters
 """
 
+import argparse
 import time
 import csv
-import os
+import json
+from collections import deque
+from contextlib import nullcontext
 from datetime import datetime
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.chrome.service import Service
-from selenium.common.exceptions import TimeoutException, NoSuchElementException, StaleElementReferenceException
+from urllib.parse import urlencode
+from hiya_cache import ResponseCache, parse_page
+from hiya_driver_pool import DriverPool
+from hiya_fingerprints import FingerprintStore, page_fingerprint
+from hiya_rate_control import AdaptiveLimiter
+from hiya_watchdog import PageStalled, Watchdog
 
-class HiyaScraper:
-    def __init__(self, headless=False):
-        """Initialize the scraper with Chrome webdriver"""
-        chrome_options = Options()
-        if headless:
-            chrome_options.add_argument("--headless")
-        chrome_options.add_argument("--no-sandbox")
-        chrome_options.add_argument("--disable-dev-shm-usage")
-        chrome_options.add_argument("--window-size=1920,1080")
-        
+EMPTY_PAGE_MESSAGES = ("don't currently have any registered phone numbers", "no registered phone numbers")
+THROTTLE_MESSAGES = ("too many requests", "rate limit")
+
+# Columns of every scraped record, in CSV order
+FIELDNAMES = [
+    'phone_number',
+    'submitted_date',
+    'submitted_by',
+    'registration_job_name',
+    'branded_call',
+    'spam_labeling',
+    'spam_category',
+    'registration_status',
+]
+
+PHONES_URL = "https://business.hiya.com/registration/cross-carrier-registration/phones"
+
+# Written by hiya_selector_bench.py --write-config
+SELECTOR_CONFIG_FILE = "hiya_selectors.json"
+
+# Bump when parse_row_cells changes, so stored page fingerprints are re-parsed
+PARSER_VERSION = 1
+
+ROW_CLASS_SELECTORS = [
+    ".MuiTableBody-root .MuiTableRow-root",
+    ".ant-table-tbody tr",
+    "[class*='TableBody'] [class*='TableRow']",
+    "[class*='table-row']",
+]
+
+
+def parse_row_cells(cell_texts):
+    """Build a record from the text of a row's cells, or None to skip the row"""
+    if len(cell_texts) < 5:
+        return None
+    
+    # Column mapping from your screenshot:
+    # [0] = checkbox
+    # [1] = Phone number
+    # [2] = Submitted (date + email)
+    # [3] = Registration job name
+    # [4] = Branded Call
+    # [5] = Spam labeling
+    # [6] = Spam category
+    # [7+] = Registration status
+    
+    phone_number = cell_texts[1].strip() if len(cell_texts) > 1 else ""
+    
+    submitted_cell_text = cell_texts[2].strip() if len(cell_texts) > 2 else ""
+    lines = submitted_cell_text.split('\n')
+    submitted_date = lines[0] if len(lines) > 0 else ""
+    submitted_email = lines[1] if len(lines) > 1 else ""
+    
+    registration_job = cell_texts[3].strip() if len(cell_texts) > 3 else ""
+    branded_call = cell_texts[4].strip() if len(cell_texts) > 4 else ""
+    spam_labeling = cell_texts[5].strip() if len(cell_texts) > 5 else ""
+    spam_category = cell_texts[6].strip() if len(cell_texts) > 6 else ""
+    registration_status = cell_texts[7].strip() if len(cell_texts) > 7 else ""
+    
+    # Skip header rows or empty rows
+    if not phone_number or phone_number == "Phone number":
+        return None
+    
+    return {
+        'phone_number': phone_number,
+        'submitted_date': submitted_date,
+        'submitted_by': submitted_email,
+        'registration_job_name': registration_job,
+        'branded_call': branded_call,
+        'spam_labeling': spam_labeling,
+        'spam_category': spam_category,
+        'registration_status': registration_status
+    }
+
+
+def _row_cell_texts(rows):
+    """Read the text of every cell in a list of row elements"""
+    from selenium.webdriver.common.by import By
+    from selenium.common.exceptions import StaleElementReferenceException
+    texts = []
+    for row in rows:
         try:
-            from webdriver_manager.chrome import ChromeDriverManager
-            driver_path = ChromeDriverManager().install()
+            cells = row.find_elements(By.TAG_NAME, "td")
             
-            if not driver_path.endswith('chromedriver'):
-                driver_dir = os.path.dirname(driver_path)
-                for root, dirs, files in os.walk(driver_dir):
-                    for file in files:
-                        if file == 'chromedriver' and os.access(os.path.join(root, file), os.X_OK):
-                            driver_path = os.path.join(root, file)
-                            break
+            if not cells:
+                cells = row.find_elements(By.CSS_SELECTOR, "[role='cell']")
             
-            service = Service(driver_path)
-            self.driver = webdriver.Chrome(service=service, options=chrome_options)
+            texts.append([cell.text for cell in cells])
+        except StaleElementReferenceException:
+            continue
         except Exception as e:
-            print(f"webdriver-manager failed: {e}")
-            print("Trying to use system ChromeDriver...")
-            self.driver = webdriver.Chrome(options=chrome_options)
+            print(f"⚠️  Error parsing row: {e}")
+            continue
+    return texts
+
+
+def find_rows_table(driver):
+    """Rows of the first <table> via 'tbody tr'"""
+    from selenium.webdriver.common.by import By
+    table = driver.find_element(By.TAG_NAME, "table")
+    return _row_cell_texts(table.find_elements(By.CSS_SELECTOR, "tbody tr"))
+
+
+def find_rows_role(driver):
+    """Elements with role='row' that contain role='cell' children"""
+    from selenium.webdriver.common.by import By
+    rows = driver.find_elements(By.CSS_SELECTOR, "[role='row']")
+    rows = [r for r in rows if r.find_elements(By.CSS_SELECTOR, "[role='cell']")]
+    return _row_cell_texts(rows)
+
+
+def find_rows_auto(driver):
+    """Standard table first, falling back to role-based rows"""
+    from selenium.common.exceptions import NoSuchElementException
+    try:
+        return find_rows_table(driver)
+    except NoSuchElementException:
+        return find_rows_role(driver)
+
+
+def find_rows_xpath_text(driver):
+    """Rows found by locating phone number text and walking up to its row"""
+    from selenium.webdriver.common.by import By
+    rows = driver.find_elements(
+        By.XPATH,
+        "//*[starts-with(normalize-space(text()), '+')]/ancestor::*[self::tr or @role='row'][1]"
+    )
+    return _row_cell_texts(rows)
+
+
+def find_rows_class(driver):
+    """Rows matched by common table component class names"""
+    from selenium.webdriver.common.by import By
+    for selector in ROW_CLASS_SELECTORS:
+        rows = driver.find_elements(By.CSS_SELECTOR, selector)
+        if rows:
+            return _row_cell_texts(rows)
+    return []
+
+
+def find_rows_script(driver):
+    """All cell texts read in a single JavaScript round trip"""
+    return driver.execute_script("""
+        var rows = document.querySelectorAll('table tbody tr');
+        if (!rows.length) {
+            rows = Array.prototype.filter.call(
+                document.querySelectorAll("[role='row']"),
+                function (r) { return r.querySelector("[role='cell']"); }
+            );
+        }
+        return Array.prototype.map.call(rows, function (row) {
+            var cells = row.querySelectorAll(':scope > td');
+            if (!cells.length) { cells = row.querySelectorAll("[role='cell']"); }
+            return Array.prototype.map.call(cells, function (c) { return c.innerText; });
+        });
+    """) or []
+
+
+# Row extraction strategies for scrape_current_page, keyed by name.
+# Each takes a driver and returns a list of cell-text lists.
+ROW_STRATEGIES = {
+    'auto': find_rows_auto,
+    'table': find_rows_table,
+    'role': find_rows_role,
+    'xpath_text': find_rows_xpath_text,
+    'class': find_rows_class,
+    'script': find_rows_script,
+}
+
+
+def load_row_strategy(path=SELECTOR_CONFIG_FILE):
+    """Return the row strategy saved by the selector benchmark, or 'auto'"""
+    try:
+        with open(path, encoding='utf-8') as f:
+            config = json.load(f)
+    except (OSError, ValueError):
+        return 'auto'
+    name = config.get('row_strategy') if isinstance(config, dict) else None
+    return name if name in ROW_STRATEGIES else 'auto'
+
+
+class HiyaScraper:
+    def __init__(self, headless=False, cache=None, replay=False, row_strategy=None, pool=None, limiter=None,
+                 filters=None, memory_profiler=None, fingerprints=None, watchdog=None):
+        """Initialize the scraper with Chrome webdriver
+        
+        Pass a ResponseCache as ``cache`` to store every page's HTML on disk
+        and serve fresh pages from it. With ``replay=True`` no browser is
+        started and every page is read from the cache instead.
+        
+        ``row_strategy`` names an entry in ROW_STRATEGIES; by default the one
+        chosen by hiya_selector_bench.py is used, falling back to 'auto'.
+        
+        Browsers come from a DriverPool. Pass ``pool`` to share one (and its
+        recycling limits) between scrapers; otherwise the scraper owns a
+        single-browser pool.
         
-        self.wait = WebDriverWait(self.driver, 15)
+        Live page loads go through an AdaptiveLimiter; pass ``limiter`` to
+        share one between scrapers running in parallel.
+        
+        ``filters`` sets the ``search``, ``status`` and ``hasBrandedCall``
+        query parameters used by get_page_url.
+        
+        Pass a hiya_memprof.MemoryProfiler as ``memory_profiler`` to record
+        memory after every page of scrape_all_pages.
+        
+        Pass a hiya_fingerprints.FingerprintStore as ``fingerprints`` to
+        reuse the previous run's records for pages whose table is unchanged.
+        
+        Every live page of scrape_all_pages runs under a hiya_watchdog.Watchdog
+        deadline; pass ``watchdog`` to change the deadline or retry count.
+        """
+        if replay and cache is None:
+            raise ValueError("Replay mode needs a response cache")
+        if row_strategy is not None and row_strategy not in ROW_STRATEGIES:
+            raise ValueError(f"Unknown row strategy: {row_strategy}")
+        
+        self.row_strategy = row_strategy or load_row_strategy()
+        self.filters = dict(filters or {})
+        self.memory_profiler = memory_profiler
+        self.prefetched = None  # Page loading in a background tab (pipelined mode)
+        self.fingerprints = fingerprints
+        self.page_url = None
+        self.cache = cache
+        self.replay = replay
+        self.page_html = None  # Set when the current page was served from the cache
         self.data = []
+        self.reached_end = False  # Set when scrape_all_pages got to the end of the data
         
+        self.owns_pool = pool is None and not replay
+        self.pool = DriverPool(headless=headless) if self.owns_pool else pool
+        self.session = None if replay else self.pool.acquire()
+        if limiter is None:
+            limiter = AdaptiveLimiter(max_limit=self.pool.size if self.pool else 1)
+        self.limiter = limiter
+        if watchdog is None and self.session is not None:
+            watchdog = Watchdog()
+        self.watchdog = watchdog
+    
+    @property
+    def driver(self):
+        """The current browser; changes when the pool recycles the session"""
+        return self.session.driver if self.session is not None else None
+    
+    @property
+    def wait(self):
+        from selenium.webdriver.support.ui import WebDriverWait
+        return WebDriverWait(self.driver, 15) if self.session is not None else None
+    
+    def remember_auth(self):
+        """Save the logged-in cookies so recycled browsers stay logged in"""
+        if self.session is not None:
+            self.pool.remember_auth(self.session)
+    
     def login(self, username, password):
         """Login to Hiya dashboard using Auth0"""
+        from selenium.webdriver.common.by import By
+        from selenium.webdriver.support import expected_conditions as EC
         print("Navigating to Hiya login page...")
         self.driver.get("https://app.hiya.com")
         
@@ -86,18 +312,67 @@ class HiyaScraper:
             print(f"❌ Login error: {e}")
             raise
     
-    def get_page_url(self, page_num):
-        """Generate the URL for a specific page (0-indexed)"""
-        return f"https://business.hiya.com/registration/cross-carrier-registration/phones?search=&status=&hasBrandedCall=&page={page_num}&size=100&sortDirection=desc&sortBy=submittedAt"
+    def get_page_url(self, page_num, **filters):
+        """Generate the URL for a specific page (0-indexed)
+        
+        Keyword arguments override the scraper's ``filters``.
+        """
+        filters = {**self.filters, **filters}
+        params = {
+            'search': filters.get('search', ''),
+            'status': filters.get('status', ''),
+            'hasBrandedCall': filters.get('hasBrandedCall', ''),
+            'page': page_num,
+            'size': 100,
+            'sortDirection': 'desc',
+            'sortBy': 'submittedAt',
+        }
+        return f"{PHONES_URL}?{urlencode(params)}"
     
     def navigate_to_page(self, page_num):
         """Navigate directly to a specific page using URL"""
         url = self.get_page_url(page_num)
-        print(f"Navigating to page {page_num + 1}...")
-        self.driver.get(url)
+        self.page_url = url
+        self.page_html = None
+        
+        if self.cache is not None:
+            self.page_html = self.cache.get(url, ignore_ttl=self.replay)
+            if self.page_html is not None:
+                print(f"Loading page {page_num + 1} from cache...")
+                return
+            if self.replay:
+                print(f"⚠️  Page {page_num + 1} is not in the cache")
+                return
+        
+        if self.prefetched is not None and self.prefetched['page'] == page_num:
+            error = self._switch_to_prefetched()
+            if error != "lost":
+                if error is None:
+                    self._page_loaded(url)
+                return
+        
+        with self.limiter.slot() as slot:
+            print(f"Navigating to page {page_num + 1}...")
+            self.driver.get(url)
+            slot.error = self._wait_for_page_content(time.monotonic())
         
+        if slot.error is None:
+            self._page_loaded(url)
+    
+    def _page_loaded(self, url):
+        """Bookkeeping after a page loaded live in the browser"""
+        if self.pool.auth_origin is None:
+            # Earlier pages may have come from the cache; keep the auth for recycled browsers
+            self.remember_auth()
+        if self.cache is not None:
+            self.cache.put(url, self.driver.page_source)
+    
+    def _wait_for_page_content(self, loaded_at, prefetched=False):
+        """Wait for the table to render; returns an error label or None"""
+        from selenium.webdriver.common.by import By
+        from selenium.common.exceptions import TimeoutException
         # Wait for page to load
-        time.sleep(3)
+        time.sleep(max(0, 3 - (time.monotonic() - loaded_at)))
         
         # Wait for table content
         try:
@@ -105,16 +380,143 @@ class HiyaScraper:
                 lambda d: d.find_elements(By.TAG_NAME, "table") or
                          d.find_elements(By.XPATH, "//*[contains(text(), 'Phone number')]")
             )
-            time.sleep(2)  # Extra wait for dynamic content
         except TimeoutException:
+            if self._is_throttled():
+                print("⚠️  Hiya is throttling requests (429)")
+                return "throttled"
             print("⚠️  Timeout waiting for page content")
+            return "timeout"
+        
+        if prefetched:
+            # The tab has been loading in the background; only wait out the rest
+            time.sleep(max(0, 5 - (time.monotonic() - loaded_at)))
+        else:
+            time.sleep(2)  # Extra wait for dynamic content
+        return None
+    
+    def prefetch_page(self, page_num):
+        """Start loading a page in a second tab while the current one is scraped"""
+        if self.session is None or self.prefetched is not None:
+            return
+        url = self.get_page_url(page_num)
+        if self.cache is not None and self.cache.get(url) is not None:
+            return
+        
+        self.limiter.acquire()
+        try:
+            current = self.driver.current_window_handle
+            self.driver.switch_to.new_window('tab')
+            handle = self.driver.current_window_handle
+            # Setting location returns immediately, unlike driver.get()
+            self.driver.execute_script("window.location.href = arguments[0];", url)
+            self.driver.switch_to.window(current)
+        except Exception as e:
+            self.limiter.release(None)
+            print(f"⚠️  Could not prefetch page {page_num + 1}: {e}")
+            return
+        
+        print(f"⏩ Prefetching page {page_num + 1} in a background tab...")
+        self.prefetched = {
+            'page': page_num,
+            'handle': handle,
+            'driver': self.driver,
+            'opened_at': time.monotonic(),
+        }
+    
+    def _switch_to_prefetched(self):
+        """Close the current tab and continue in the prefetched one
+        
+        Returns the load error, None on success, or "lost" if the tab is
+        gone (e.g. the pool recycled the browser) and a normal load is needed.
+        """
+        prefetched, self.prefetched = self.prefetched, None
+        try:
+            if prefetched['driver'] is not self.driver or prefetched['handle'] not in self.driver.window_handles:
+                self.limiter.release(None)
+                return "lost"
+            self.driver.close()
+            self.driver.switch_to.window(prefetched['handle'])
+        except Exception as e:
+            print(f"⚠️  Lost prefetched tab: {e}")
+            self.limiter.release(None)
+            return "lost"
+        
+        print(f"Switching to prefetched page {prefetched['page'] + 1}...")
+        error = None
+        try:
+            error = self._wait_for_page_content(prefetched['opened_at'], prefetched=True)
+        except Exception as e:
+            # E.g. the watchdog killed the browser; the prefetch's slot must still be freed
+            error = type(e).__name__
+            raise
+        finally:
+            self.limiter.release(time.monotonic() - prefetched['opened_at'], error)
+        return error
+    
+    def _discard_prefetch(self):
+        """Close a prefetched tab that will not be used"""
+        prefetched, self.prefetched = self.prefetched, None
+        if prefetched is None:
+            return
+        self.limiter.release(None)
+        try:
+            if prefetched['driver'] is self.driver and prefetched['handle'] in self.driver.window_handles:
+                current = self.driver.current_window_handle
+                self.driver.switch_to.window(prefetched['handle'])
+                self.driver.close()
+                self.driver.switch_to.window(current)
+        except Exception:
+            pass
+    
+    def _page_deadline(self, label):
+        """Watchdog deadline for live page work; a no-op in replay mode"""
+        if self.watchdog is None or self.session is None:
+            return nullcontext()
+        return self.watchdog.watch(self.session, label)
+    
+    def _recover_from_stall(self, error):
+        """Replace the killed browser with a fresh, logged-in one"""
+        print(f"⚠️  {error} - restarting the browser")
+        self.pool.recycle(self.session, "stalled page")
+        if self.memory_profiler is not None:
+            self.memory_profiler.browser_recycled("stalled page")
+        self._discard_prefetch()
+    
+    def _load_first_page(self, page_num):
+        """Open the first page and read the page count, retrying if it stalls"""
+        attempts = self.watchdog.max_retries + 1 if self.watchdog is not None else 1
+        for _ in range(attempts):
+            try:
+                with self._page_deadline(f"Page {page_num + 1}"):
+                    self.navigate_to_page(page_num)
+                    if self.session is not None and self.page_html is None:
+                        # We're logged in by now; keep the auth state for recycled browsers
+                        self.remember_auth()
+                    return self.get_total_pages()
+            except PageStalled as e:
+                self._recover_from_stall(e)
+        raise PageStalled(f"Page {page_num + 1} stalled {attempts} times")
+    
+    def _is_throttled(self):
+        """Check whether the current page is a rate limit error page"""
+        from selenium.webdriver.common.by import By
+        try:
+            text = self.driver.title + "\n" + self.driver.find_element(By.TAG_NAME, "body").text
+            text = text.lower()
+        except Exception:
+            return False
+        return any(message in text for message in THROTTLE_MESSAGES)
     
     def get_total_pages(self):
         """Get the total number of pages from pagination"""
+        import re
+        if self.driver is None or self.page_html is not None:
+            return self._get_cached_total_pages()
+        from selenium.webdriver.common.by import By
+        
         try:
             # Look for "of X pages" text
             pagination_text = self.driver.find_element(By.XPATH, "//*[contains(text(), 'of') and contains(text(), 'pages')]").text
-            import re
             match = re.search(r'of (\d+) pages', pagination_text)
             if match:
                 total = int(match.group(1))
@@ -136,8 +538,36 @@ class HiyaScraper:
         
         return None
     
+    def _get_cached_total_pages(self):
+        """Read the total number of pages from the cached page text"""
+        import re
+        if self.page_html is None:
+            return None
+        
+        rows, text = parse_page(self.page_html)
+        match = re.search(r'of (\d+) pages', text)
+        if match:
+            total = int(match.group(1))
+            print(f"📊 Found {total} total pages")
+            return total
+        
+        match = re.search(r'([\d,]+)\s+phone numbers', text)
+        if match:
+            total_records = int(match.group(1).replace(',', ''))
+            total_pages = (total_records + 99) // 100  # Ceiling division
+            print(f"📊 Calculated {total_pages} pages from {total_records} records")
+            return total_pages
+        
+        print("⚠️  Could not determine total pages from cached page")
+        return None
+    
     def scrape_current_page(self):
         """Scrape data from the current page"""
+        if self.driver is None or self.page_html is not None:
+            return self._scrape_cached_page()
+        from selenium.webdriver.common.by import By
+        from selenium.common.exceptions import NoSuchElementException
+        
         try:
             # Wait for any loading to complete
             time.sleep(2)
@@ -157,82 +587,42 @@ class HiyaScraper:
             self.driver.execute_script("window.scrollTo(0, 0);")
             time.sleep(1)
             
+            # Reuse last run's records if the table hasn't changed
+            fingerprint = None
+            if self.fingerprints is not None:
+                fingerprint = page_fingerprint(self.driver)
+            if fingerprint is not None:
+                records = self.fingerprints.lookup(self.page_url, fingerprint, self._parser_version())
+                if records is not None:
+                    print(f"🔖 Page unchanged since last run - reusing {len(records)} stored records")
+                    self.data.extend(records)
+                    return len(records)
+            
             # Find all rows
             rows = []
             
             try:
-                table = self.driver.find_element(By.TAG_NAME, "table")
-                rows = table.find_elements(By.CSS_SELECTOR, "tbody tr")
-            except:
-                try:
-                    rows = self.driver.find_elements(By.CSS_SELECTOR, "[role='row']")
-                    rows = [r for r in rows if r.find_elements(By.CSS_SELECTOR, "[role='cell']")]
-                except:
-                    pass
+                rows = ROW_STRATEGIES[self.row_strategy](self.driver)
+            except Exception as e:
+                print(f"⚠️  Row strategy '{self.row_strategy}' failed: {e}")
             
             if not rows:
                 print("⚠️  No rows found on this page")
                 return 0
             
-            page_count = 0
-            for row in rows:
-                try:
-                    cells = row.find_elements(By.TAG_NAME, "td")
-                    
-                    if not cells:
-                        cells = row.find_elements(By.CSS_SELECTOR, "[role='cell']")
-                    
-                    if len(cells) < 5:
-                        continue
-                    
-                    # Column mapping from your screenshot:
-                    # [0] = checkbox
-                    # [1] = Phone number
-                    # [2] = Submitted (date + email)
-                    # [3] = Registration job name
-                    # [4] = Branded Call
-                    # [5] = Spam labeling
-                    # [6] = Spam category
-                    # [7+] = Registration status
-                    
-                    phone_number = cells[1].text.strip() if len(cells) > 1 else ""
-                    
-                    submitted_cell_text = cells[2].text.strip() if len(cells) > 2 else ""
-                    lines = submitted_cell_text.split('\n')
-                    submitted_date = lines[0] if len(lines) > 0 else ""
-                    submitted_email = lines[1] if len(lines) > 1 else ""
-                    
-                    registration_job = cells[3].text.strip() if len(cells) > 3 else ""
-                    branded_call = cells[4].text.strip() if len(cells) > 4 else ""
-                    spam_labeling = cells[5].text.strip() if len(cells) > 5 else ""
-                    spam_category = cells[6].text.strip() if len(cells) > 6 else ""
-                    registration_status = cells[7].text.strip() if len(cells) > 7 else ""
-                    
-                    # Skip header rows or empty rows
-                    if not phone_number or phone_number == "Phone number":
-                        continue
-                    
-                    record = {
-                        'phone_number': phone_number,
-                        'submitted_date': submitted_date,
-                        'submitted_by': submitted_email,
-                        'registration_job_name': registration_job,
-                        'branded_call': branded_call,
-                        'spam_labeling': spam_labeling,
-                        'spam_category': spam_category,
-                        'registration_status': registration_status
-                    }
-                    
-                    self.data.append(record)
-                    page_count += 1
-                    
-                except StaleElementReferenceException:
-                    continue
-                except Exception as e:
-                    print(f"⚠️  Error parsing row: {e}")
+            page_records = []
+            for cell_texts in rows:
+                record = parse_row_cells(cell_texts)
+                if record is None:
                     continue
+                
+                page_records.append(record)
             
-            return page_count
+            self.data.extend(page_records)
+            if fingerprint is not None and page_records:
+                self.fingerprints.record(self.page_url, fingerprint, page_records, self._parser_version())
+            
+            return len(page_records)
             
         except Exception as e:
             print(f"❌ Error scraping page: {e}")
@@ -240,54 +630,162 @@ class HiyaScraper:
             traceback.print_exc()
             return 0
     
-    def scrape_all_pages(self, max_pages=None):
-        """Scrape all pages by navigating directly via URL"""
+    def _parser_version(self):
+        """Version stored with page fingerprints: row strategy and parser"""
+        return f"{self.row_strategy}:{PARSER_VERSION}"
+    
+    def _scrape_cached_page(self):
+        """Scrape data from the cached HTML of the current page"""
+        if self.page_html is None:
+            print("📭 Page not available in cache - reached end of replay")
+            return -1
+        
+        rows, text = parse_page(self.page_html)
+        if any(message in text for message in EMPTY_PAGE_MESSAGES):
+            print("📭 Found 'no registered phone numbers' message - reached end of data")
+            return -1
+        
+        if not rows:
+            print("⚠️  No rows found on this page")
+            return 0
+        
+        page_count = 0
+        for cell_texts in rows:
+            record = parse_row_cells(cell_texts)
+            if record is None:
+                continue
+            self.data.append(record)
+            page_count += 1
+        
+        return page_count
+    
+    def scrape_all_pages(self, max_pages=None, start_page=0, end_page=None, pipelined=False):
+        """Scrape all pages by navigating directly via URL
+        
+        ``start_page`` and ``end_page`` (exclusive, 0-indexed) limit the run
+        to a page range, e.g. for one shard of a distributed export.
+        ``max_pages`` caps the number of pages scraped from ``start_page``.
+        
+        With ``pipelined=True`` the next page loads in a second tab while the
+        current one is being scraped, overlapping page loads with extraction
+        in a single browser session.
+        
+        The fingerprint store is saved even if the run fails part way.
+        """
+        try:
+            self._scrape_pages(max_pages, start_page, end_page, pipelined)
+        finally:
+            if self.fingerprints is not None:
+                self.fingerprints.save()
+    
+    def _scrape_pages(self, max_pages, start_page, end_page, pipelined):
+        """The page loop of scrape_all_pages"""
         print("\n" + "="*60)
         print("STARTING TO SCRAPE ALL PAGES")
         print("="*60)
+        self.reached_end = False
+        
+        if self.memory_profiler is not None:
+            self.memory_profiler.start()
         
-        # First, go to page 0 to get total pages
-        self.navigate_to_page(0)
-        total_pages = self.get_total_pages()
+        # First, go to the first page to get total pages
+        site_pages = total_pages = self._load_first_page(start_page)
         
         if not total_pages:
             print("⚠️  Could not determine total pages. Will scrape until empty page.")
-            total_pages = max_pages if max_pages else 50
+            if end_page is not None:
+                total_pages = end_page
+            else:
+                total_pages = start_page + (max_pages if max_pages else 50)
+        
+        if end_page is not None:
+            total_pages = min(total_pages, end_page)
+        if max_pages:
+            total_pages = min(total_pages, start_page + max_pages)
         
-        # Start scraping from page 0
-        for page_num in range(total_pages):
+        # (page number, retries so far); stalled pages go back to the front
+        pending = deque((page_num, 0) for page_num in range(start_page, total_pages))
+        while pending:
+            page_num, attempt = pending.popleft()
             print(f"\n{'='*60}")
-            print(f"PAGE {page_num + 1} of {total_pages}")
+            print(f"PAGE {page_num + 1} of {total_pages}" + (f" (retry {attempt})" if attempt else ""))
             print(f"{'='*60}")
             
-            # Navigate to this page (skip if we're already on page 0)
-            if page_num > 0:
-                self.navigate_to_page(page_num)
+            records_before = len(self.data)
+            try:
+                with self._page_deadline(f"Page {page_num + 1}"):
+                    # Navigate to this page (skip if we're already on the first page)
+                    if page_num > start_page or attempt:
+                        self.navigate_to_page(page_num)
+                    
+                    if pipelined and pending:
+                        self.prefetch_page(pending[0][0])
+                    
+                    # Scrape the page
+                    count = self.scrape_current_page()
+            except PageStalled as e:
+                del self.data[records_before:]
+                self._recover_from_stall(e)
+                if attempt < self.watchdog.max_retries:
+                    print(f"🔁 Re-queueing page {page_num + 1}")
+                    pending.appendleft((page_num, attempt + 1))
+                else:
+                    print(f"❌ Skipping page {page_num + 1} after {attempt + 1} stalls")
+                continue
             
-            # Scrape the page
-            count = self.scrape_current_page()
+            # Sample memory before a recycle can replace the browser
+            if self.memory_profiler is not None:
+                self.memory_profiler.page_done(page_num, self.driver, len(self.data))
+            
+            # Let the pool recycle the browser once it has done enough pages
+            if self.session is not None and self.page_html is None:
+                recycled = self.pool.page_done(self.session)
+                if recycled and self.memory_profiler is not None:
+                    self.memory_profiler.browser_recycled(recycled)
             
             # Check if we hit the empty page message
             if count == -1:
                 print("✅ Reached end of data (empty page message found)")
+                self.reached_end = True
                 break
             
             if count == 0:
                 print("⚠️  No records found on this page")
+                if self.session is not None and self.page_html is None:
+                    self.limiter.backoff("empty page")
                 # Don't break immediately - might just be a loading issue
                 # But if we get 2 empty pages in a row, stop
                 continue
             
             print(f"✅ Scraped {count} records from page {page_num + 1}")
             print(f"📊 Total records so far: {len(self.data)}")
+            if self.session is not None and self.page_html is None:
+                print(f"🚦 Rate control: {self.limiter.metrics()}")
+        else:
+            # Every page up to the dashboard's own last page was visited
+            if site_pages and total_pages >= site_pages:
+                self.reached_end = True
+        
+        self._discard_prefetch()
         
         print(f"\n{'='*60}")
         print(f"SCRAPING COMPLETE")
         print(f"{'='*60}")
         print(f"✅ Total records scraped: {len(self.data)}")
+        if self.watchdog is not None and self.watchdog.stalls:
+            stalled = ", ".join(dict.fromkeys(stall['page'] for stall in self.watchdog.stalls))
+            print(f"⏰ Stalled pages (restarted the browser): {stalled}")
+        
+        if self.memory_profiler is not None:
+            self.memory_profiler.report()
+            self.memory_profiler.stop()
     
-    def save_to_csv(self, filename=None):
-        """Save scraped data to CSV file"""
+    def save_to_csv(self, filename=None, normalize=False):
+        """Save scraped data to CSV file
+        
+        With ``normalize=True`` the records are written as typed columns
+        (E.164 phones, ISO timestamps) via hiya_postprocess.
+        """
         if not filename:
             filename = f"hiya_phone_numbers_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
         
@@ -297,6 +795,12 @@ class HiyaScraper:
         
         print(f"\n💾 Saving data to {filename}...")
         
+        if normalize:
+            from hiya_postprocess import normalize_records, write_normalized
+            write_normalized(normalize_records(self.data), filename)
+            print(f"✅ Successfully saved {len(self.data)} normalized records to {filename}")
+            return filename
+        
         with open(filename, 'w', newline='', encoding='utf-8') as csvfile:
             fieldnames = self.data[0].keys()
             writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
@@ -309,12 +813,40 @@ class HiyaScraper:
     
     def close(self):
         """Close the browser"""
-        self.driver.quit()
-        print("Browser closed")
+        if self.session is None:
+            return
+        self._discard_prefetch()
+        self.pool.release(self.session)
+        self.session = None
+        if self.owns_pool:
+            self.pool.close()
+            print("Browser closed")
 
 
 def main():
     """Main function to run the scraper"""
+    parser = argparse.ArgumentParser(description="Scrape all phone numbers from the Hiya dashboard")
+    parser.add_argument('-o', '--output', help="CSV file to save to (default: timestamped name)")
+    parser.add_argument('--headless', action='store_true', help="Run Chrome without a window")
+    parser.add_argument('--max-pages', type=int, help="Stop after this many pages")
+    parser.add_argument('--pipelined', action='store_true', help="Prefetch the next page in a second tab")
+    parser.add_argument('--recycle-pages', type=int, default=200, metavar='N',
+                        help="Restart the browser after this many pages (default: %(default)s, 0 = never)")
+    parser.add_argument('--max-rss-mb', type=float, metavar='MB',
+                        help="Restart the browser once its memory exceeds this")
+    parser.add_argument('--cache', metavar='DIR',
+                        help="Response cache directory: store every page's HTML and load pages cached "
+                             "within --cache-ttl from disk instead of the site")
+    parser.add_argument('--cache-ttl', type=float, default=24 * 60 * 60, metavar='SECONDS',
+                        help="Age up to which cached pages are reused (default: %(default).0f, 0 = write only)")
+    parser.add_argument('--normalize', action='store_true', help="Save typed, normalized columns")
+    parser.add_argument('--skip-unchanged', metavar='STORE', nargs='?', const="hiya_fingerprints.json.gz",
+                        help="Reuse records of pages unchanged since the last run (default store: %(const)s)")
+    parser.add_argument('--profile-memory', metavar='JSON', nargs='?', const="memory_profile.json",
+                        help="Record memory after every page and save the samples (default: %(const)s)")
+    parser.add_argument('--memory-budget', type=float, metavar='MB',
+                        help="Stop once Python plus browser memory exceeds this (implies --profile-memory)")
+    args = parser.parse_args()
     
     print("="*60)
     print("Hiya Phone Number Scraper")
@@ -325,7 +857,14 @@ def main():
     username = input("Enter your Hiya username/email: ")
     password = input("Enter your Hiya password: ")
     
-    scraper = HiyaScraper(headless=False)
+    cache = ResponseCache(args.cache, ttl=args.cache_ttl) if args.cache else None
+    fingerprints = FingerprintStore(args.skip_unchanged) if args.skip_unchanged else None
+    profiler = None
+    if args.profile_memory or args.memory_budget:
+        from hiya_memprof import MemoryProfiler
+        profiler = MemoryProfiler(budget_mb=args.memory_budget)
+    pool = DriverPool(headless=args.headless, max_pages=args.recycle_pages, max_rss_mb=args.max_rss_mb)
+    scraper = HiyaScraper(pool=pool, cache=cache, memory_profiler=profiler, fingerprints=fingerprints)
     
     try:
         # Login
@@ -337,11 +876,11 @@ def main():
         input()
         
         # Scrape all pages
-        scraper.scrape_all_pages()
+        scraper.scrape_all_pages(max_pages=args.max_pages, pipelined=args.pipelined)
         
         # Save to CSV
         if scraper.data:
-            filename = scraper.save_to_csv()
+            filename = scraper.save_to_csv(args.output, normalize=args.normalize)
             print(f"\n🎉 SUCCESS! Your data is saved to: {filename}")
             print(f"📊 Total records: {len(scraper.data)}")
         else:
@@ -351,7 +890,7 @@ def main():
         print("\n\n⚠️  Interrupted by user")
         if scraper.data:
             print("💾 Saving partial data...")
-            scraper.save_to_csv()
+            scraper.save_to_csv(args.output, normalize=args.normalize)
     except Exception as e:
         print(f"\n❌ Error: {e}")
         import traceback
@@ -359,12 +898,16 @@ def main():
         
         if scraper.data:
             print("\n💾 Saving partial data...")
-            scraper.save_to_csv()
+            scraper.save_to_csv(args.output, normalize=args.normalize)
     
     finally:
+        if profiler is not None and profiler.pages:
+            print(f"🧠 Memory samples saved to {profiler.save(args.profile_memory or 'memory_profile.json')}")
         print("\nClosing browser in 3 seconds...")
         time.sleep(3)
         scraper.close()
+        pool.close()
+        print("Browser closed")
 
 
 if __name__ == "__main__":
@@ -5,47 +5,19 @@ This version will help us inspect the page and figure out the correct selectors
 
 import time
 import csv
-import os
 from datetime import datetime
-from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.chrome.service import Service
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
+from hiya_driver_pool import DriverPool
 
 class HiyaScraperDebug:
     def __init__(self, headless=False):
         """Initialize the scraper with Chrome webdriver"""
-        chrome_options = Options()
-        if headless:
-            chrome_options.add_argument("--headless")
-        chrome_options.add_argument("--no-sandbox")
-        chrome_options.add_argument("--disable-dev-shm-usage")
-        
-        # Try to use webdriver-manager, but fall back to system chromedriver if needed
-        try:
-            from webdriver_manager.chrome import ChromeDriverManager
-            driver_path = ChromeDriverManager().install()
-            
-            # Fix for Mac ARM: webdriver-manager sometimes returns wrong file path
-            if not driver_path.endswith('chromedriver'):
-                driver_dir = os.path.dirname(driver_path)
-                # Look for the actual chromedriver executable
-                for root, dirs, files in os.walk(driver_dir):
-                    for file in files:
-                        if file == 'chromedriver' and os.access(os.path.join(root, file), os.X_OK):
-                            driver_path = os.path.join(root, file)
-                            break
-            
-            service = Service(driver_path)
-            self.driver = webdriver.Chrome(service=service, options=chrome_options)
-        except Exception as e:
-            print(f"webdriver-manager failed: {e}")
-            print("Trying to use system ChromeDriver...")
-            self.driver = webdriver.Chrome(options=chrome_options)
-        
+        self.pool = DriverPool(headless=headless, window_size=None)
+        self.session = self.pool.acquire()
+        self.driver = self.session.driver
         self.wait = WebDriverWait(self.driver, 10)
         self.data = []
         
@@ -280,10 +252,13 @@ class HiyaScraperDebug:
         else:
             print("❌ No methods worked. The page structure may be different than expected.")
             print("   Please check page_source.html and page_screenshot.png")
+        print("\nTo time every strategy offline against the saved page, run:")
+        print("   python hiya_selector_bench.py page_source.html")
     
     def close(self):
         """Close the browser"""
-        self.driver.quit()
+        self.pool.release(self.session)
+        self.pool.close()
         print("\nBrowser closed")
 
 
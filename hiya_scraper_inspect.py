@@ -4,40 +4,17 @@ This will help us see what's actually on the page
 """
 
 import time
-import os
-from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.chrome.service import Service
+from hiya_driver_pool import DriverPool
 
 class HiyaScraperDebug:
     def __init__(self):
         """Initialize the scraper with Chrome webdriver"""
-        chrome_options = Options()
-        chrome_options.add_argument("--no-sandbox")
-        chrome_options.add_argument("--disable-dev-shm-usage")
-        chrome_options.add_argument("--window-size=1920,1080")
-        
-        try:
-            from webdriver_manager.chrome import ChromeDriverManager
-            driver_path = ChromeDriverManager().install()
-            
-            if not driver_path.endswith('chromedriver'):
-                driver_dir = os.path.dirname(driver_path)
-                for root, dirs, files in os.walk(driver_dir):
-                    for file in files:
-                        if file == 'chromedriver' and os.access(os.path.join(root, file), os.X_OK):
-                            driver_path = os.path.join(root, file)
-                            break
-            
-            service = Service(driver_path)
-            self.driver = webdriver.Chrome(service=service, options=chrome_options)
-        except Exception as e:
-            print(f"webdriver-manager failed: {e}")
-            self.driver = webdriver.Chrome(options=chrome_options)
-        
+        self.pool = DriverPool()
+        self.session = self.pool.acquire()
+        self.driver = self.session.driver
         self.wait = WebDriverWait(self.driver, 15)
         
     def login(self, username, password):
@@ -201,12 +178,14 @@ class HiyaScraperDebug:
         print("\nPlease check the saved files:")
         print(f"  - {filename}")
         print(f"  - {screenshot_file}")
+        print(f"\nTo time every row strategy offline: python hiya_selector_bench.py {filename}")
         print("\nThe browser will stay open for 30 seconds for manual inspection...")
         time.sleep(30)
     
     def close(self):
         """Close the browser"""
-        self.driver.quit()
+        self.pool.release(self.session)
+        self.pool.close()
         print("Browser closed")
 
 
@@ -0,0 +1,150 @@
+"""
+Hiya Phone Number Scraper - Selector Benchmark
+Times every row extraction strategy against saved page snapshots, offline
+"""
+
+import argparse
+import json
+import os
+import re
+import statistics
+import tempfile
+import time
+
+from hiya_cache import ResponseCache, parse_page
+from hiya_scraper import HiyaScraper, ROW_STRATEGIES, SELECTOR_CONFIG_FILE, parse_row_cells
+
+
+def load_snapshots(paths, cache_dir=None):
+    """Collect (name, html) pairs from saved HTML files and/or a response cache"""
+    snapshots = []
+    for path in paths:
+        with open(path, encoding='utf-8') as f:
+            snapshots.append((os.path.basename(path), f.read()))
+
+    if cache_dir:
+        for entry in ResponseCache(cache_dir, ttl=None).entries():
+            if entry.get('content_type', 'text/html') == 'text/html':
+                snapshots.append((entry['url'], entry['content']))
+
+    return snapshots
+
+
+def _records(rows):
+    """Turn cell-text lists into the records scrape_current_page would keep"""
+    records = []
+    for cell_texts in rows:
+        record = parse_row_cells(cell_texts)
+        if record is not None:
+            records.append(record)
+    return records
+
+
+def _write_offline_copy(html, directory, index):
+    """Write a snapshot with its scripts stripped so loading it needs no network"""
+    html = re.sub(r'<script\b.*?</script>', '', html, flags=re.IGNORECASE | re.DOTALL)
+    path = os.path.join(directory, f"snapshot_{index}.html")
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(html)
+    return path
+
+
+def benchmark(snapshots, strategies=None, repeat=5, headless=True):
+    """Run each strategy against each snapshot.
+
+    Returns a dict of strategy name -> {'median_ms', 'correct', 'rows'} where
+    'median_ms' is the median time per page summed over snapshots and
+    'correct' is True when the strategy extracted exactly the records the
+    offline parser finds on every snapshot.
+    """
+    strategies = strategies or list(ROW_STRATEGIES)
+    results = {name: {'median_ms': 0.0, 'correct': True, 'rows': 0} for name in strategies}
+
+    scraper = HiyaScraper(headless=headless)
+    try:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            for index, (name, html) in enumerate(snapshots):
+                expected_rows, text = parse_page(html)
+                expected = _records(expected_rows)
+
+                path = _write_offline_copy(html, tmp_dir, index)
+                scraper.driver.get(f"file://{os.path.abspath(path)}")
+
+                print(f"\n--- {name}: {len(expected)} expected records ---")
+                for strategy in strategies:
+                    timings = []
+                    records = []
+                    try:
+                        for _ in range(repeat):
+                            start = time.perf_counter()
+                            rows = ROW_STRATEGIES[strategy](scraper.driver)
+                            timings.append((time.perf_counter() - start) * 1000)
+                        records = _records(rows)
+                    except Exception as e:
+                        print(f"❌ {strategy}: failed ({e})")
+                        results[strategy]['correct'] = False
+                        continue
+
+                    median = statistics.median(timings)
+                    matches = records == expected
+                    results[strategy]['median_ms'] += median
+                    results[strategy]['rows'] += len(records)
+                    results[strategy]['correct'] = results[strategy]['correct'] and matches
+                    mark = "✅" if matches else "❌"
+                    print(f"{mark} {strategy}: {len(records)} records in {median:.1f} ms")
+    finally:
+        scraper.close()
+
+    return results
+
+
+def recommend(results):
+    """Return the fastest strategy that extracted the right records, or None"""
+    correct = [(r['median_ms'], name) for name, r in results.items() if r['correct']]
+    if not correct:
+        return None
+    return min(correct)[1]
+
+
+def main():
+    """Benchmark row strategies and optionally save the fastest correct one"""
+    parser = argparse.ArgumentParser(description="Benchmark row extraction strategies against saved pages")
+    parser.add_argument('snapshots', nargs='*', help="Saved page HTML files (e.g. page_0_source.html)")
+    parser.add_argument('--cache', help="Also use every page stored in this response cache")
+    parser.add_argument('--strategy', action='append', choices=list(ROW_STRATEGIES), help="Only run these strategies")
+    parser.add_argument('--repeat', type=int, default=5, help="Timed runs per strategy and page")
+    parser.add_argument('--show-browser', action='store_true', help="Run Chrome with a visible window")
+    parser.add_argument('--write-config', action='store_true', help=f"Save the recommendation to {SELECTOR_CONFIG_FILE}")
+    args = parser.parse_args()
+
+    snapshots = load_snapshots(args.snapshots, args.cache)
+    if not snapshots:
+        parser.error("no snapshots given; pass HTML files or --cache")
+
+    print("="*60)
+    print(f"Benchmarking {len(args.strategy or ROW_STRATEGIES)} strategies on {len(snapshots)} snapshots")
+    print("="*60)
+
+    results = benchmark(snapshots, args.strategy, args.repeat, headless=not args.show_browser)
+
+    print("\n" + "="*60)
+    print("SUMMARY")
+    print("="*60)
+    for name, r in sorted(results.items(), key=lambda item: item[1]['median_ms']):
+        status = "correct" if r['correct'] else "WRONG"
+        print(f"   {name:<12} {r['median_ms']:>8.1f} ms  {r['rows']:>6} records  {status}")
+
+    best = recommend(results)
+    if best is None:
+        print("\n❌ No strategy extracted the expected records.")
+        return
+
+    print(f"\n🏆 Fastest correct strategy: {best}")
+    if args.write_config:
+        with open(SELECTOR_CONFIG_FILE, 'w', encoding='utf-8') as f:
+            json.dump({'row_strategy': best, 'results': results}, f, indent=2)
+        print(f"✅ Saved to {SELECTOR_CONFIG_FILE}; HiyaScraper will use it by default")
+
+
+if __name__ == "__main__":
+    main()
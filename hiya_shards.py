@@ -0,0 +1,391 @@
+"""
+Hiya Phone Number Scraper - Sharded Export
+Splits one export into shards that several worker processes or hosts claim
+from a SQLite queue, then merges their CSVs into one deduplicated file
+"""
+
+import argparse
+import csv
+import heapq
+import itertools
+import json
+import os
+import socket
+import sqlite3
+import sys
+import threading
+import time
+from contextlib import closing
+from datetime import datetime
+
+from hiya_postprocess import SUBMITTED_DATE_FORMATS
+
+DEFAULT_LEASE_SECONDS = 15 * 60
+DEFAULT_MAX_ATTEMPTS = 3
+DEFAULT_MAX_FAILURES = 3
+
+
+class ShardQueue:
+    """SQLite-backed queue of shards with time-limited leases.
+
+    A worker claims the oldest pending shard (or one whose lease expired
+    because its worker died), renews the lease while it works and marks the
+    shard done with the path of its output CSV. Claims run inside
+    ``BEGIN IMMEDIATE`` so two workers never get the same shard. A shard
+    whose lease expired after its last allowed attempt is marked failed.
+    """
+
+    def __init__(self, path, lease_seconds=DEFAULT_LEASE_SECONDS, max_attempts=DEFAULT_MAX_ATTEMPTS):
+        self.path = path
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        with closing(self._connect()) as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS shards (
+                    id INTEGER PRIMARY KEY,
+                    filters TEXT NOT NULL,
+                    start_page INTEGER NOT NULL,
+                    end_page INTEGER,
+                    state TEXT NOT NULL DEFAULT 'pending',
+                    worker TEXT,
+                    lease_expires REAL,
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    output TEXT,
+                    records INTEGER
+                )
+            """)
+
+    def _connect(self):
+        """Open an autocommit connection; use with closing()"""
+        conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def add(self, filters, start_page=0, end_page=None):
+        """Queue a shard and return its id"""
+        with closing(self._connect()) as conn:
+            cursor = conn.execute(
+                "INSERT INTO shards (filters, start_page, end_page) VALUES (?, ?, ?)",
+                (json.dumps(filters, sort_keys=True), start_page, end_page)
+            )
+            return cursor.lastrowid
+
+    def claim(self, worker):
+        """Lease the next available shard to a worker, or return None"""
+        now = time.time()
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            # Its worker died on the last attempt, so nobody will release it
+            conn.execute(
+                "UPDATE shards SET state = 'failed', worker = NULL, lease_expires = NULL "
+                "WHERE state = 'leased' AND lease_expires < ? AND attempts >= ?",
+                (now, self.max_attempts)
+            )
+            row = conn.execute("""
+                SELECT * FROM shards
+                WHERE (state = 'pending' OR (state = 'leased' AND lease_expires < ?))
+                  AND attempts < ?
+                ORDER BY id LIMIT 1
+            """, (now, self.max_attempts)).fetchone()
+            if row is None:
+                conn.execute("COMMIT")
+                return None
+            conn.execute(
+                "UPDATE shards SET state = 'leased', worker = ?, lease_expires = ?, attempts = attempts + 1 WHERE id = ?",
+                (worker, now + self.lease_seconds, row['id'])
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+
+        shard = dict(row)
+        shard['filters'] = json.loads(shard['filters'])
+        return shard
+
+    def renew(self, shard_id, worker):
+        """Extend a lease; returns False if the worker no longer holds it"""
+        with closing(self._connect()) as conn:
+            cursor = conn.execute(
+                "UPDATE shards SET lease_expires = ? WHERE id = ? AND worker = ? AND state = 'leased'",
+                (time.time() + self.lease_seconds, shard_id, worker)
+            )
+            return cursor.rowcount == 1
+
+    def complete(self, shard_id, worker, output, records):
+        """Mark a shard done with the CSV it produced"""
+        with closing(self._connect()) as conn:
+            conn.execute(
+                "UPDATE shards SET state = 'done', output = ?, records = ?, lease_expires = NULL "
+                "WHERE id = ? AND worker = ?",
+                (output, records, shard_id, worker)
+            )
+
+    def release(self, shard_id, worker):
+        """Give a shard back after a failure so another worker can retry it"""
+        with closing(self._connect()) as conn:
+            conn.execute(
+                "UPDATE shards SET state = CASE WHEN attempts >= ? THEN 'failed' ELSE 'pending' END, "
+                "worker = NULL, lease_expires = NULL WHERE id = ? AND worker = ?",
+                (self.max_attempts, shard_id, worker)
+            )
+
+    def shards(self):
+        """Return every shard in id order"""
+        with closing(self._connect()) as conn:
+            rows = conn.execute("SELECT * FROM shards ORDER BY id").fetchall()
+        shards = []
+        for row in rows:
+            shard = dict(row)
+            shard['filters'] = json.loads(shard['filters'])
+            shards.append(shard)
+        return shards
+
+    def counts(self):
+        """Number of shards in each state"""
+        with closing(self._connect()) as conn:
+            rows = conn.execute("SELECT state, COUNT(*) FROM shards GROUP BY state").fetchall()
+        return {state: count for state, count in rows}
+
+
+def plan_shards(statuses=None, branded=None, total_pages=None, pages_per_shard=None):
+    """Build shard specs from filter values and/or page ranges.
+
+    Each shard is a ``(filters, start_page, end_page)`` tuple. Filter values
+    are combined as a cartesian product; page ranges are only used when
+    ``total_pages`` and ``pages_per_shard`` are both given. The last range
+    has no end page and runs until the empty-page message.
+    """
+    filter_sets = []
+    for status, has_branded in itertools.product(statuses or [''], branded or ['']):
+        filters = {}
+        if status:
+            filters['status'] = status
+        if has_branded:
+            filters['hasBrandedCall'] = has_branded
+        filter_sets.append(filters)
+
+    if total_pages and pages_per_shard:
+        ranges = [(start, start + pages_per_shard) for start in range(0, total_pages, pages_per_shard)]
+        # Leave the last range open so pages added after planning are not dropped
+        ranges[-1] = (ranges[-1][0], None)
+    else:
+        ranges = [(0, None)]
+
+    return [(filters, start, end) for filters in filter_sets for start, end in ranges]
+
+
+class _LeaseKeeper(threading.Thread):
+    """Renews a shard lease in the background while a worker scrapes it"""
+
+    def __init__(self, queue, shard_id, worker):
+        super().__init__(daemon=True)
+        self.queue = queue
+        self.shard_id = shard_id
+        self.worker = worker
+        self.stopped = threading.Event()
+
+    def run(self):
+        interval = max(1, self.queue.lease_seconds / 3)
+        while not self.stopped.wait(interval):
+            if not self.queue.renew(self.shard_id, self.worker):
+                print(f"⚠️  Lost the lease on shard {self.shard_id}")
+                return
+
+    def stop(self):
+        self.stopped.set()
+
+
+def _write_shard_csv(records, path):
+    from hiya_scraper import FIELDNAMES
+    fieldnames = list(records[0].keys()) if records else FIELDNAMES
+    with open(path, 'w', newline='', encoding='utf-8') as csvfile:
+        writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
+        writer.writeheader()
+        writer.writerows(records)
+
+
+def run_worker(queue, output_dir, scraper, worker=None, max_failures=DEFAULT_MAX_FAILURES):
+    """Claim and scrape shards until the queue is drained; returns shards done
+
+    After a failed shard the browser is recycled before the next claim. The
+    worker stops after ``max_failures`` failed shards in a row instead of
+    using up every shard's attempts on a broken session.
+    """
+    worker = worker or f"{socket.gethostname()}:{os.getpid()}"
+    os.makedirs(output_dir, exist_ok=True)
+    done = 0
+    failures = 0
+
+    while True:
+        shard = queue.claim(worker)
+        if shard is None:
+            print(f"✅ No shards left for worker {worker}")
+            return done
+
+        print(f"\n📦 Worker {worker} claimed shard {shard['id']}: "
+              f"filters={shard['filters']} pages={shard['start_page']}..{shard['end_page'] or 'end'}")
+        keeper = _LeaseKeeper(queue, shard['id'], worker)
+        keeper.start()
+        try:
+            scraper.filters = shard['filters']
+            scraper.data = []
+            scraper.scrape_all_pages(start_page=shard['start_page'], end_page=shard['end_page'])
+            if not scraper.data and not scraper.reached_end:
+                # Nothing scraped and no empty-page message: don't record the shard as empty
+                raise RuntimeError("no records and no end-of-data message")
+            output = os.path.abspath(os.path.join(output_dir, f"shard_{shard['id']:05d}.csv"))
+            _write_shard_csv(scraper.data, output)
+        except Exception as e:
+            print(f"❌ Shard {shard['id']} failed: {e}")
+            queue.release(shard['id'], worker)
+            failures += 1
+            if failures >= max_failures:
+                print(f"🛑 Worker {worker} stopping after {failures} failed shards in a row")
+                return done
+            if scraper.session is not None:
+                scraper.pool.recycle(scraper.session, f"shard {shard['id']} failed")
+            continue
+        finally:
+            keeper.stop()
+
+        queue.complete(shard['id'], worker, output, len(scraper.data))
+        print(f"✅ Shard {shard['id']} done: {len(scraper.data)} records → {output}")
+        done += 1
+        failures = 0
+
+
+def _submitted_key(record):
+    text = record.get('submitted_date', '').strip()
+    for fmt in SUBMITTED_DATE_FORMATS:
+        try:
+            return datetime.strptime(text, fmt)
+        except ValueError:
+            continue
+    return datetime.min
+
+
+def _read_csv(path):
+    with open(path, newline='', encoding='utf-8') as csvfile:
+        yield from csv.DictReader(csvfile)
+
+
+def merge_shards(queue, output):
+    """Merge finished shard CSVs into one file, newest submission first.
+
+    Shards that only differ by page range are concatenated in page order,
+    which is already the dashboard's order. Filter shards are each sorted by
+    submission date, so they are k-way merged on it. Phone numbers seen in
+    an earlier shard are dropped. Returns the number of records written.
+    """
+    shards = queue.shards()
+    pending = [s['id'] for s in shards if s['state'] != 'done']
+    if pending:
+        print(f"⚠️  {len(pending)} shards are not done yet: {pending}")
+
+    groups = {}
+    for shard in shards:
+        if shard['state'] == 'done':
+            key = json.dumps(shard['filters'], sort_keys=True)
+            groups.setdefault(key, []).append(shard)
+
+    streams = []
+    for group in groups.values():
+        group.sort(key=lambda s: s['start_page'])
+        streams.append(itertools.chain.from_iterable(_read_csv(s['output']) for s in group))
+
+    if len(streams) == 1:
+        records = streams[0]
+    else:
+        records = heapq.merge(*streams, key=_submitted_key, reverse=True)
+
+    seen = set()
+    written = 0
+    writer = None
+    with open(output, 'w', newline='', encoding='utf-8') as csvfile:
+        for record in records:
+            if record['phone_number'] in seen:
+                continue
+            seen.add(record['phone_number'])
+            if writer is None:
+                writer = csv.DictWriter(csvfile, fieldnames=list(record.keys()))
+                writer.writeheader()
+            writer.writerow(record)
+            written += 1
+
+    print(f"✅ Merged {written} unique records into {output}")
+    return written
+
+
+def _split(values):
+    return [v.strip() for v in values.split(',')] if values else None
+
+
+def main():
+    """Command line entry point: plan, work, status and merge"""
+    parser = argparse.ArgumentParser(description="Sharded Hiya export")
+    parser.add_argument('--queue', default='hiya_shards.sqlite', help="Shard queue database")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    plan = subparsers.add_parser('plan', help="Queue shards for an export")
+    plan.add_argument('--status', help="Comma-separated status filter values, one shard each")
+    plan.add_argument('--branded', help="Comma-separated hasBrandedCall values, e.g. true,false")
+    plan.add_argument('--pages', type=int, help="Total pages to split into ranges")
+    plan.add_argument('--pages-per-shard', type=int, default=10)
+
+    work = subparsers.add_parser('work', help="Claim and scrape shards until none are left")
+    work.add_argument('--output-dir', default='hiya_shards', help="Where shard CSVs are written")
+    work.add_argument('--headless', action='store_true')
+    work.add_argument('--replay', metavar='CACHE_DIR', help="Scrape from a response cache instead of the site")
+    work.add_argument('--lease', type=int, default=DEFAULT_LEASE_SECONDS, help="Lease length in seconds")
+    work.add_argument('--max-failures', type=int, default=DEFAULT_MAX_FAILURES,
+                      help="Stop after this many failed shards in a row")
+
+    subparsers.add_parser('status', help="Show shard counts by state")
+
+    merge = subparsers.add_parser('merge', help="Merge finished shards into one CSV")
+    merge.add_argument('output', nargs='?', help="Merged CSV filename")
+
+    args = parser.parse_args()
+
+    if args.command == 'plan':
+        queue = ShardQueue(args.queue)
+        specs = plan_shards(_split(args.status), _split(args.branded), args.pages, args.pages_per_shard)
+        for filters, start, end in specs:
+            queue.add(filters, start, end)
+        print(f"✅ Queued {len(specs)} shards in {args.queue}")
+
+    elif args.command == 'work':
+        from hiya_scraper import HiyaScraper
+        queue = ShardQueue(args.queue, lease_seconds=args.lease)
+        if args.replay:
+            from hiya_cache import ResponseCache
+            scraper = HiyaScraper(cache=ResponseCache(args.replay, ttl=None), replay=True)
+        else:
+            username = os.environ.get('HIYA_USERNAME') or input("Enter your Hiya username/email: ")
+            password = os.environ.get('HIYA_PASSWORD') or input("Enter your Hiya password: ")
+            scraper = HiyaScraper(headless=args.headless)
+            scraper.login(username, password)
+            if sys.stdin.isatty():
+                print("\n🔐 If you have 2FA enabled, please complete it now...")
+                print("Press Enter once you're logged in and ready to continue...")
+                input()
+        try:
+            run_worker(queue, args.output_dir, scraper, max_failures=args.max_failures)
+        finally:
+            scraper.close()
+
+    elif args.command == 'status':
+        for state, count in sorted(ShardQueue(args.queue).counts().items()):
+            print(f"   {state:<8} {count}")
+
+    elif args.command == 'merge':
+        output = args.output or f"hiya_phone_numbers_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
+        merge_shards(ShardQueue(args.queue), output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+Hiya Phone Number Scraper - Page Watchdog
+Wall-clock deadline per page that kills a hung browser so the run can go on
+"""
+
+import sys
+import threading
+import time
+import traceback
+from contextlib import contextmanager
+
+from hiya_driver_pool import kill_driver
+
+
+class PageStalled(Exception):
+    """Raised when a page did not finish before its deadline"""
+
+
+class Watchdog:
+    """Per-page deadline enforced from a timer thread.
+
+    WebDriverWait only bounds explicit waits; a ``driver.get`` or
+    ``find_elements`` call that never returns blocks the scraper forever.
+    When a page runs past ``deadline`` seconds the watchdog prints where the
+    scraping thread is stuck and kills ChromeDriver and its browser, which
+    makes the blocked call fail at once. The guarded block then raises
+    PageStalled so the caller can recycle the session and retry the page,
+    up to ``max_retries`` times.
+    """
+
+    def __init__(self, deadline=180, max_retries=2):
+        self.deadline = deadline
+        self.max_retries = max_retries
+        self.stalls = []
+
+    def _expire(self, label, session, thread_id, state):
+        state['expired'] = True
+        frame = sys._current_frames().get(thread_id)
+        print(f"\n⏰ {label} stalled for {self.deadline}s - killing the browser")
+        if frame is not None:
+            # Innermost scraper frames, then the library call that is blocking
+            stack = traceback.extract_stack(frame)
+            ours = [f for f in stack
+                    if 'site-packages' not in f.filename and not f.filename.startswith(sys.base_prefix)]
+            print("   Stuck in:")
+            for f in ours[-2:] + ([stack[-1]] if stack[-1] not in ours else []):
+                print(f"     {f.filename}:{f.lineno} in {f.name}: {f.line}")
+        kill_driver(session.driver)
+
+    @contextmanager
+    def watch(self, session, label):
+        """Run the block under the deadline; raises PageStalled if it expired"""
+        state = {'expired': False}
+        start = time.monotonic()
+        timer = threading.Timer(self.deadline, self._expire,
+                                args=(label, session, threading.get_ident(), state))
+        timer.daemon = True
+        timer.start()
+        try:
+            yield
+        except Exception:
+            # Whatever the killed browser raised is a symptom of the stall
+            if not state['expired']:
+                raise
+        finally:
+            timer.cancel()
+
+        if state['expired']:
+            elapsed = time.monotonic() - start
+            self.stalls.append({'page': label, 'seconds': round(elapsed, 1), 'at': time.time()})
+            raise PageStalled(f"{label} did not finish within {self.deadline}s")
@@ -0,0 +1,221 @@
+import os
+import re
+import sys
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FIXTURES = os.path.join(ROOT, 'tests', 'fixtures')
+sys.path.insert(0, ROOT)
+
+from hiya_cache import ResponseCache, parse_page  # noqa: E402
+from hiya_fingerprints import FINGERPRINT_SCRIPT  # noqa: E402
+from hiya_scraper import HiyaScraper  # noqa: E402
+
+
+def load_fixture(name):
+    """HTML of a saved page under tests/fixtures"""
+    with open(os.path.join(FIXTURES, name), encoding='utf-8') as f:
+        return f.read()
+
+
+def page_url(page_num, filters=None):
+    """The URL HiyaScraper requests for a page"""
+    return HiyaScraper.get_page_url(SimpleNamespace(filters=filters or {}), page_num)
+
+
+def cache_pages(cache, pages, filters=None):
+    """Store fixture pages in a ResponseCache under the URLs the scraper requests"""
+    for page_num, name in enumerate(pages):
+        cache.put(page_url(page_num, filters), load_fixture(name))
+
+
+@pytest.fixture
+def page_cache(tmp_path):
+    """A response cache holding a three-page export: two data pages and the empty page"""
+    cache = ResponseCache(str(tmp_path / 'cache'), ttl=None)
+    cache_pages(cache, ['page_table.html', 'page_roles.html', 'page_empty.html'])
+    return cache
+
+
+class FakeProcess:
+    """Stands in for the ChromeDriver process; kill() makes every later call fail"""
+
+    def __init__(self):
+        self.pid = -1
+        self.dead = threading.Event()
+
+    @property
+    def killed(self):
+        return self.dead.is_set()
+
+    def kill(self):
+        self.dead.set()
+
+
+class FakeService:
+    def __init__(self):
+        self.process = FakeProcess()
+
+
+class FakeElement:
+    def __init__(self, text=""):
+        self.text = text
+
+
+class FakeSwitchTo:
+    def __init__(self, driver):
+        self.driver = driver
+
+    def new_window(self, kind):
+        self.driver._check()
+        self.driver.tabs.append({'url': "about:blank", 'html': ""})
+        self.driver.handle = len(self.driver.tabs) - 1
+
+    def window(self, handle):
+        self.driver._check()
+        self.driver.handle = handle
+
+
+class FakeDriver:
+    """Minimal WebDriver that serves fixture HTML by URL, with tabs.
+
+    Rows come from the 'script' row strategy, answered with parse_page, so
+    the live code path sees the same cells as replay. Set the browser's
+    ``hang`` to a callable(driver, call) to block inside get() or
+    find_elements(); ``driver.wait_until_killed()`` blocks like a hung call.
+    """
+
+    def __init__(self, browser):
+        self.browser = browser
+        self.service = FakeService()
+        self.title = "Hiya"
+        self.cookies = []
+        self.tabs = [{'url': "about:blank", 'html': ""}]
+        self.handle = 0
+        self.switch_to = FakeSwitchTo(self)
+
+    def _check(self):
+        if self.service.process.killed:
+            raise ConnectionError("chromedriver is gone")
+
+    def _maybe_hang(self, call):
+        if self.browser.hang is not None:
+            self.browser.hang(self, call)
+            self._check()
+
+    def wait_until_killed(self):
+        self.service.process.dead.wait()
+
+    def _load(self, url):
+        self.browser.requests.append(url)
+        self.tabs[self.handle] = {'url': url, 'html': self.browser.pages.get(url, load_fixture('page_empty.html'))}
+
+    def get(self, url):
+        self._check()
+        self._maybe_hang('get')
+        self._load(url)
+
+    @property
+    def current_url(self):
+        return self.tabs[self.handle]['url']
+
+    @property
+    def html(self):
+        return self.tabs[self.handle]['html']
+
+    @property
+    def current_window_handle(self):
+        self._check()
+        return self.handle
+
+    @property
+    def window_handles(self):
+        self._check()
+        return [handle for handle, tab in enumerate(self.tabs) if tab is not None]
+
+    def close(self):
+        self._check()
+        self.tabs[self.handle] = None
+
+    @property
+    def page_source(self):
+        self._check()
+        return self.html
+
+    def get_cookies(self):
+        self._check()
+        return [{'name': 'session', 'value': 'logged-in'}]
+
+    def add_cookie(self, cookie):
+        self.cookies.append(cookie)
+
+    def execute_script(self, script, *args):
+        self._check()
+        if script == "return 1":
+            return 1
+        if 'localStorage' in script:
+            return {}
+        if 'window.location.href' in script:
+            self._load(args[0])
+            return None
+        if "querySelectorAll(':scope > td')" in script:
+            return parse_page(self.html)[0]
+        if script == FINGERPRINT_SCRIPT:
+            return "\n".join("\t".join(cells) for cells in parse_page(self.html)[0])
+        return None
+
+    def find_elements(self, by, value):
+        self._check()
+        self._maybe_hang('find_elements')
+        return [FakeElement()] if self.html else []
+
+    def find_element(self, by, value):
+        from selenium.common.exceptions import NoSuchElementException
+        self._check()
+        text = parse_page(self.html)[1] if self.html else ""
+        if 'registered phone numbers' in value:
+            if "registered phone numbers" not in text:
+                raise NoSuchElementException(value)
+            return FakeElement(text)
+        if 'pages' in value:
+            match = re.search(r'Page \d+ of \d+ pages', text)
+            if match is None:
+                raise NoSuchElementException(value)
+            return FakeElement(match.group(0))
+        return FakeElement(text)
+
+    def quit(self):
+        pass
+
+
+class FakeBrowser:
+    """Every FakeDriver the pool starts, plus the pages they can load"""
+
+    def __init__(self):
+        self.pages = {}
+        self.drivers = []
+        self.requests = []
+        self.hang = None
+
+    def new_driver(self, *args, **kwargs):
+        driver = FakeDriver(self)
+        self.drivers.append(driver)
+        return driver
+
+    def serve(self, pages, filters=None):
+        for page_num, name in enumerate(pages):
+            self.pages[page_url(page_num, filters)] = load_fixture(name)
+
+
+@pytest.fixture
+def fake_browser(monkeypatch):
+    """Replace Chrome with FakeDriver and skip the scraper's fixed sleeps"""
+    import hiya_driver_pool
+    browser = FakeBrowser()
+    monkeypatch.setattr(hiya_driver_pool, 'create_chrome_driver', browser.new_driver)
+    monkeypatch.setattr(time, 'sleep', lambda seconds: None)
+    return browser
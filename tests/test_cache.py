@@ -0,0 +1,105 @@
+import csv
+import time
+
+import hiya_cache
+from conftest import load_fixture
+from hiya_cache import ResponseCache, parse_page, replay
+from hiya_scraper import HiyaScraper, parse_row_cells
+
+
+def test_parse_page_reads_table_rows():
+    rows, text = parse_page(load_fixture('page_table.html'))
+
+    assert len(rows) == 3
+    assert rows[0] == ['', '+1 213 731 2373', 'Mar 4, 2024\nops@example.com', 'Spring campaign',
+                       'Yes', 'Clean', '', 'Registered']
+    assert rows[2][3] == 'Winter & holidays'
+    assert 'Page 1 of 3 pages' in text
+    assert '__STATE__' not in text
+
+
+def test_parse_page_falls_back_to_role_rows():
+    rows, _ = parse_page(load_fixture('page_roles.html'))
+
+    # The header row has no role='cell' children and is skipped
+    assert rows == [['', '+1 305 555 0142', 'Jan 15, 2024\nteam@example.com', 'Q1 outreach',
+                     'Yes', 'Clean', '', 'Registered']]
+
+
+def test_parse_page_empty_message():
+    rows, text = parse_page(load_fixture('page_empty.html'))
+
+    assert rows == []
+    assert "don't currently have any registered phone numbers" in text
+
+
+def test_parse_row_cells_maps_columns():
+    rows, _ = parse_page(load_fixture('page_table.html'))
+
+    assert parse_row_cells(rows[1]) == {
+        'phone_number': '+1 415 555 0100',
+        'submitted_date': 'Mar 3, 2024',
+        'submitted_by': 'Ops@Example.com',
+        'registration_job_name': 'Spring campaign',
+        'branded_call': 'No',
+        'spam_labeling': 'Spam Risk',
+        'spam_category': 'Telemarketing',
+        'registration_status': 'Pending',
+    }
+
+
+def test_parse_row_cells_skips_header_and_short_rows():
+    assert parse_row_cells(['', 'Phone number', 'Submitted', 'Job', 'Branded']) is None
+    assert parse_row_cells(['', '+1 213 731 2373']) is None
+
+
+def test_cache_ttl(tmp_path, monkeypatch):
+    cache = ResponseCache(str(tmp_path), ttl=60)
+    cache.put('https://example.com/a', '<html>a</html>')
+    now = time.time()
+    monkeypatch.setattr(hiya_cache.time, 'time', lambda: now - 120)
+    cache.put('https://example.com/b', '<html>b</html>')
+    monkeypatch.undo()
+
+    assert cache.get('https://example.com/a') == '<html>a</html>'
+    assert cache.get('https://example.com/missing') is None
+    assert cache.get('https://example.com/b') is None
+    assert cache.get('https://example.com/b', ignore_ttl=True) == '<html>b</html>'
+    assert cache.prune() == 1
+    assert [entry['url'] for entry in cache.entries()] == ['https://example.com/a']
+
+
+def test_zero_ttl_cache_is_write_only(tmp_path):
+    cache = ResponseCache(str(tmp_path), ttl=0)
+    cache.put('https://example.com/a', '<html>a</html>')
+
+    assert cache.get('https://example.com/a') is None
+    assert cache.get('https://example.com/a', ignore_ttl=True) == '<html>a</html>'
+
+
+def test_replay_from_cached_fixtures(page_cache, tmp_path):
+    output = replay(page_cache.cache_dir, str(tmp_path / 'replayed.csv'))
+
+    with open(output, newline='', encoding='utf-8') as f:
+        records = list(csv.DictReader(f))
+    assert [r['phone_number'] for r in records] == [
+        '+1 213 731 2373', '+1 415 555 0100', '+1 646 555 0199', '+1 305 555 0142',
+    ]
+
+
+def test_replay_command_caps_pages(page_cache, tmp_path, monkeypatch):
+    output = str(tmp_path / 'replayed.csv')
+    monkeypatch.setattr('sys.argv', ['hiya_cache.py', 'replay', page_cache.cache_dir, output, '--max-pages', '1'])
+
+    hiya_cache.main()
+
+    with open(output, newline='', encoding='utf-8') as f:
+        assert len(list(csv.DictReader(f))) == 3
+
+
+def test_replay_reads_total_pages_from_cache(page_cache):
+    scraper = HiyaScraper(cache=page_cache, replay=True)
+    scraper.navigate_to_page(0)
+
+    assert scraper.get_total_pages() == 3
+    assert scraper.scrape_current_page() == 3
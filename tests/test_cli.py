@@ -0,0 +1,44 @@
+import subprocess
+import sys
+
+from conftest import ROOT
+
+
+def run_python(code, cwd):
+    result = subprocess.run([sys.executable, '-c', code], cwd=cwd, capture_output=True, text=True, check=True)
+    return result.stdout
+
+
+def test_replay_does_not_load_selenium(page_cache, tmp_path):
+    output = run_python(
+        f"import sys; sys.path.insert(0, {ROOT!r})\n"
+        "from hiya_cache import replay\n"
+        f"replay({page_cache.cache_dir!r}, {str(tmp_path / 'out.csv')!r})\n"
+        "print('selenium loaded:', any(m.startswith('selenium') for m in sys.modules))\n",
+        cwd=str(tmp_path),
+    )
+
+    assert "Total records scraped: 4" in output
+    assert "selenium loaded: False" in output
+
+
+def test_offline_modules_do_not_load_selenium(tmp_path):
+    output = run_python(
+        f"import sys; sys.path.insert(0, {ROOT!r})\n"
+        "import hiya_scraper, hiya_postprocess, hiya_report, hiya_diff, hiya_shards\n"
+        "print(sorted(m for m in sys.modules if m.startswith(('selenium', 'webdriver_manager'))))\n",
+        cwd=str(tmp_path),
+    )
+
+    assert output.strip() == "[]"
+
+
+def test_diff_does_not_load_lookup_or_selenium(tmp_path):
+    output = run_python(
+        f"import sys; sys.path.insert(0, {ROOT!r})\n"
+        "import hiya_diff\n"
+        "print(sorted(m for m in sys.modules if m == 'hiya_lookup' or m.startswith('selenium')))\n",
+        cwd=str(tmp_path),
+    )
+
+    assert output.strip() == "[]"
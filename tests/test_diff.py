@@ -0,0 +1,34 @@
+import csv
+
+from hiya_diff import diff_exports, save_diff
+from hiya_postprocess import number_key
+from hiya_scraper import FIELDNAMES
+
+
+def write_export(path, rows):
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=FIELDNAMES)
+        writer.writeheader()
+        for phone, spam_labeling in rows:
+            writer.writerow({'phone_number': phone, 'spam_labeling': spam_labeling, 'registration_status': 'Registered'})
+    return str(path)
+
+
+def test_number_key():
+    assert number_key('+1 213 731 2373') == number_key('(213) 731-2373') == '12137312373'
+    assert number_key('+44 20 7946 0958') == '442079460958'
+    assert number_key('Phone number') == ''
+
+
+def test_diff_exports(tmp_path):
+    old = write_export(tmp_path / 'old.csv', [('+1 213 731 2373', 'Clean'), ('+1 415 555 0100', 'Clean')])
+    new = write_export(tmp_path / 'new.csv', [('2137312373', 'Spam Risk'), ('+1 646 555 0199', 'Clean')])
+
+    diff = diff_exports(old, new)
+
+    assert [r['phone_number'] for r in diff['added']] == ['+1 646 555 0199']
+    assert [r['phone_number'] for r in diff['removed']] == ['+1 415 555 0100']
+    assert [entry['changes'] for entry in diff['changed']] == [{'spam_labeling': ('Clean', 'Spam Risk')}]
+
+    with open(save_diff(diff, str(tmp_path / 'changes.csv')), newline='', encoding='utf-8') as f:
+        assert [row['change'] for row in csv.DictReader(f)] == ['added', 'removed', 'changed']
@@ -0,0 +1,79 @@
+import pytest
+
+import hiya_scraper
+from conftest import load_fixture, page_url
+from hiya_fingerprints import FingerprintStore, page_fingerprint
+from hiya_scraper import HiyaScraper
+
+PAGES = ['page_table.html', 'page_roles.html', 'page_empty.html']
+
+
+def scrape(store_path):
+    store = FingerprintStore(store_path)
+    scraper = HiyaScraper(row_strategy='script', fingerprints=store)
+    try:
+        scraper.scrape_all_pages()
+    finally:
+        scraper.close()
+    return scraper.data, store
+
+
+def test_unchanged_pages_reuse_stored_records(fake_browser, tmp_path):
+    fake_browser.serve(PAGES)
+    store_path = str(tmp_path / 'fingerprints.json.gz')
+    first, store = scrape(store_path)
+    assert (store.reused, store.changed) == (0, 2)
+
+    second, store = scrape(store_path)
+
+    assert (store.reused, store.changed) == (2, 0)
+    assert second == first
+
+
+def test_changed_page_is_parsed_again(fake_browser, tmp_path):
+    fake_browser.serve(PAGES)
+    store_path = str(tmp_path / 'fingerprints.json.gz')
+    scrape(store_path)
+
+    fake_browser.pages[page_url(1)] = load_fixture('page_roles.html').replace('Q1 outreach', 'Q2 outreach')
+    data, store = scrape(store_path)
+
+    assert (store.reused, store.changed) == (1, 1)
+    assert data[-1]['registration_job_name'] == 'Q2 outreach'
+
+
+def test_entries_from_another_parser_version_are_ignored(fake_browser, tmp_path, monkeypatch):
+    fake_browser.serve(PAGES)
+    store_path = str(tmp_path / 'fingerprints.json.gz')
+    scrape(store_path)
+
+    monkeypatch.setattr(hiya_scraper, 'PARSER_VERSION', hiya_scraper.PARSER_VERSION + 1)
+    _, store = scrape(store_path)
+
+    assert (store.reused, store.changed) == (0, 2)
+
+
+def test_empty_table_text_has_no_fingerprint(fake_browser):
+    fake_browser.serve(PAGES)
+    driver = fake_browser.new_driver()
+    driver.get(page_url(0))
+    assert page_fingerprint(driver) is not None
+
+    driver.tabs[driver.handle]['html'] = "<html><body><table><tbody></tbody></table></body></html>"
+    assert page_fingerprint(driver) is None
+
+
+def test_store_is_saved_when_the_run_fails(fake_browser, tmp_path):
+    fake_browser.serve(PAGES)
+
+    def hang(driver, call):
+        if call == 'get' and len(fake_browser.requests) == 1:
+            raise ConnectionError("chromedriver is gone")
+
+    fake_browser.hang = hang
+    store_path = str(tmp_path / 'fingerprints.json.gz')
+    with pytest.raises(ConnectionError):
+        scrape(store_path)
+
+    # Page 1 was parsed before page 2 failed to load
+    assert list(FingerprintStore(store_path).pages) == [page_url(0)]
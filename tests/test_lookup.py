@@ -0,0 +1,63 @@
+from hiya_driver_pool import DriverPool
+from hiya_lookup import BulkLookup
+from hiya_scraper import HiyaScraper
+
+LISTED = "+1 213 731 2373"  # first row of page_table.html
+ROLES = "+1 305 555 0142"   # only row of page_roles.html
+UNKNOWN = "+1 917 555 0123"  # in no fixture
+
+
+def lookup(fake_browser, numbers, sessions=1, **kwargs):
+    pool = DriverPool(size=sessions, max_pages=None)
+    scrapers = [HiyaScraper(pool=pool, row_strategy='script') for _ in range(sessions)]
+    try:
+        return BulkLookup(scrapers, **kwargs).run(numbers)
+    finally:
+        for scraper in scrapers:
+            scraper.close()
+        pool.close()
+
+
+def test_single_number_hit_keeps_only_its_records(fake_browser):
+    fake_browser.serve(['page_table.html'], filters={'search': LISTED})
+
+    records, missing, failed = lookup(fake_browser, [LISTED])
+
+    assert [record['phone_number'] for record in records] == [LISTED]
+    assert missing == [] and failed == []
+
+
+def test_number_without_results_is_missing(fake_browser):
+    records, missing, failed = lookup(fake_browser, [UNKNOWN])
+
+    assert records == []
+    assert missing == [UNKNOWN] and failed == []
+
+
+def test_unsupported_batch_search_falls_back_to_single_numbers(fake_browser):
+    # The combined query finds nothing; each number on its own does
+    fake_browser.serve(['page_table.html'], filters={'search': LISTED})
+    fake_browser.serve(['page_roles.html'], filters={'search': ROLES})
+
+    records, missing, failed = lookup(fake_browser, [LISTED, ROLES, UNKNOWN], batch_size=2)
+
+    assert [record['phone_number'] for record in records] == [LISTED, ROLES]
+    assert missing == [UNKNOWN] and failed == []
+    assert any('213' in url and '305' in url for url in fake_browser.requests)
+
+
+def test_failing_number_is_retried_on_a_fresh_browser_then_reported(fake_browser):
+    fake_browser.serve(['page_table.html'], filters={'search': LISTED})
+
+    def hang(driver, call):
+        if call == 'find_elements' and '917' in driver.current_url:
+            raise ConnectionError("chromedriver is gone")
+
+    fake_browser.hang = hang
+    records, missing, failed = lookup(fake_browser, [UNKNOWN, LISTED], sessions=2, max_attempts=2)
+
+    assert [record['phone_number'] for record in records] == [LISTED]
+    assert missing == []
+    assert failed == [UNKNOWN]
+    # One browser per session plus one restart per failed search
+    assert len(fake_browser.drivers) == 4
@@ -0,0 +1,50 @@
+import pytest
+
+pd = pytest.importorskip('pandas')
+
+from conftest import load_fixture  # noqa: E402
+from hiya_cache import parse_page  # noqa: E402
+from hiya_postprocess import (  # noqa: E402
+    NORMALIZED_COLUMNS, normalize_frame, normalize_records, read_export, to_e164, write_normalized,
+)
+from hiya_scraper import FIELDNAMES, parse_row_cells  # noqa: E402
+
+
+def fixture_records():
+    rows, _ = parse_page(load_fixture('page_table.html'))
+    return [parse_row_cells(cells) for cells in rows]
+
+
+def test_normalize_fixture_page():
+    frame = normalize_records(fixture_records())
+
+    assert list(frame.columns) == NORMALIZED_COLUMNS
+    assert list(frame['phone_number']) == ['+12137312373', '+14155550100', '+16465550199']
+    assert frame['submitted_at'].iloc[0] == pd.Timestamp('2024-03-04')
+    # Submitter emails are case-folded into one category
+    assert frame['submitted_by'].nunique() == 2
+    assert frame['spam_category'].isna().tolist() == [True, False, True]
+
+
+def test_to_e164_formats():
+    phones = pd.Series(['+1 213 731 2373', '2137312373', '1 (213) 731-2373', '+44 20 7946 0958', '12345'])
+
+    assert to_e164(phones).tolist() == ['+12137312373', '+12137312373', '+12137312373',
+                                        '+442079460958', pd.NA]
+
+
+def test_normalize_no_records():
+    frame = normalize_records([])
+
+    assert list(frame.columns) == NORMALIZED_COLUMNS
+    assert len(frame) == 0
+
+
+def test_export_header_only_csv(tmp_path):
+    source = tmp_path / 'empty.csv'
+    source.write_text(','.join(FIELDNAMES) + '\n', encoding='utf-8')
+
+    frame = normalize_frame(read_export(str(source)))
+    write_normalized(frame, str(tmp_path / 'out.csv'))
+
+    assert (tmp_path / 'out.csv').read_text(encoding='utf-8').strip() == ','.join(NORMALIZED_COLUMNS)
@@ -0,0 +1,51 @@
+import threading
+
+import pytest
+
+from hiya_rate_control import AdaptiveLimiter
+
+
+def test_limit_grows_while_latency_is_flat():
+    limiter = AdaptiveLimiter(initial_limit=1, max_limit=3)
+    for _ in range(20):
+        limiter.acquire()
+        limiter.release(1.0)
+
+    assert limiter.metrics()['limit'] == 3
+    assert limiter.metrics()['successes'] == 20
+
+
+def test_errors_cut_the_limit_and_add_delay():
+    limiter = AdaptiveLimiter(initial_limit=4, max_limit=4, backoff_interval=2.0)
+    limiter.acquire()
+    limiter.release(1.0, error="throttled")
+
+    metrics = limiter.metrics()
+    assert metrics['limit'] == 2
+    assert metrics['interval_s'] == 2.0
+    assert metrics['failures'] == 1
+
+
+def test_slot_reports_exceptions_and_frees_the_slot():
+    limiter = AdaptiveLimiter(initial_limit=2, max_limit=2)
+    with pytest.raises(TimeoutError):
+        with limiter.slot():
+            raise TimeoutError()
+
+    assert limiter.in_flight == 0
+    assert limiter.failures == 1
+
+
+def test_acquire_blocks_at_the_limit():
+    limiter = AdaptiveLimiter(initial_limit=1, max_limit=1)
+    limiter.acquire()
+    waiting = threading.Thread(target=limiter.acquire, daemon=True)
+    waiting.start()
+    waiting.join(timeout=0.2)
+    assert waiting.is_alive()
+
+    # Abandoned requests free their slot without counting as success or failure
+    limiter.release(None)
+    waiting.join(timeout=1)
+    assert not waiting.is_alive()
+    assert limiter.successes == limiter.failures == 0
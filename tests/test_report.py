@@ -0,0 +1,45 @@
+from conftest import cache_pages
+from hiya_cache import ResponseCache
+from hiya_report import build_report, iter_cache_rows, iter_csv_rows
+
+
+def test_build_report_groups_and_totals():
+    report = build_report([
+        ('Spring', 'Ops@Example.com', 'Clean', 'Registered'),
+        ('Spring', 'ops@example.com', 'Spam Risk', 'Pending'),
+        ('', 'sales@example.com', 'Clean', ''),
+    ])
+
+    assert report['records'] == 3
+    assert report['totals']['spam_labeling'] == {'Clean': 2, 'Spam Risk': 1}
+    assert report['by_submitted_by']['ops@example.com']['records'] == 2
+    assert report['by_registration_job_name']['(blank)']['registration_status'] == {'(blank)': 1}
+
+
+def test_csv_rows_tolerate_truncated_lines(tmp_path):
+    path = tmp_path / 'partial.csv'
+    path.write_text(
+        "phone_number,submitted_date,submitted_by,registration_job_name,branded_call,"
+        "spam_labeling,spam_category,registration_status\n"
+        "+1 213 731 2373,\"Mar 4, 2024\",ops@example.com,Spring,No,Clean,,Registered\n"
+        "\n"
+        "+1 415 555 0100,\"Mar 3, 2024\",ops@example.com,Spring\n",
+        encoding='utf-8',
+    )
+
+    assert list(iter_csv_rows(str(path))) == [
+        ('Spring', 'ops@example.com', 'Clean', 'Registered'),
+        ('Spring', 'ops@example.com', '', ''),
+    ]
+
+
+def test_cache_rows_count_each_number_once(tmp_path):
+    # The same page cached under the listing URL and under a search URL
+    cache = ResponseCache(str(tmp_path / 'cache'), ttl=None)
+    cache_pages(cache, ['page_table.html', 'page_roles.html'])
+    cache_pages(cache, ['page_table.html'], filters={'search': '+1 213 731 2373'})
+
+    rows = list(iter_cache_rows(cache.cache_dir))
+
+    assert len(rows) == 4
+    assert build_report(rows)['records'] == 4
@@ -0,0 +1,81 @@
+from conftest import cache_pages, page_url
+from hiya_cache import ResponseCache
+from hiya_driver_pool import DriverPool
+from hiya_scraper import HiyaScraper
+
+
+def test_auth_captured_when_first_page_is_cached(fake_browser, tmp_path):
+    # Page 1 is fresh in the cache, so the first live load is page 2
+    cache = ResponseCache(str(tmp_path / 'cache'))
+    cache_pages(cache, ['page_table.html'])
+    fake_browser.serve(['page_table.html', 'page_roles.html', 'page_empty.html'])
+    pool = DriverPool(max_pages=None)
+    scraper = HiyaScraper(cache=cache, pool=pool, row_strategy='script')
+
+    scraper.scrape_all_pages()
+    assert len(scraper.data) == 4
+    assert page_url(0).startswith(pool.auth_origin + "/")
+
+    # A browser killed by the watchdog can't be asked for its cookies;
+    # its replacement must still start logged in
+    scraper.driver.service.process.kill()
+    pool.recycle(scraper.session, "stalled page")
+    assert scraper.driver.cookies == [{'name': 'session', 'value': 'logged-in'}]
+    scraper.close()
+    pool.close()
+
+
+def test_memory_sampled_before_recycle(fake_browser, monkeypatch):
+    import hiya_memprof
+    from hiya_memprof import MB, MemoryProfiler
+
+    # Each browser reports a different RSS: 100 MB for the first, 200 MB for the second, ...
+    monkeypatch.setattr(hiya_memprof, 'driver_rss',
+                        lambda driver: (fake_browser.drivers.index(driver) + 1) * 100 * MB)
+    fake_browser.serve(['page_table.html', 'page_roles.html', 'page_empty.html'])
+    pool = DriverPool(max_pages=2)
+    profiler = MemoryProfiler()
+    scraper = HiyaScraper(pool=pool, row_strategy='script', memory_profiler=profiler)
+
+    scraper.scrape_all_pages()
+    scraper.close()
+    pool.close()
+
+    # Page 2 is sampled on the browser that loaded it, then the pool recycles it
+    assert [sample['browser_rss_mb'] for sample in profiler.pages] == [100.0, 100.0, 200.0]
+    assert [sample['recycled'] for sample in profiler.pages] == [None, "2 pages", None]
+
+
+def test_stall_while_switching_to_prefetched_tab(fake_browser):
+    import threading
+    from hiya_watchdog import Watchdog
+
+    fake_browser.serve(['page_table.html', 'page_roles.html', 'page_empty.html'])
+    stalled = []
+
+    def hang(driver, call):
+        # The first wait for page 2's table, in the prefetched tab, never returns
+        if call == 'find_elements' and 'page=1' in driver.current_url and not stalled:
+            stalled.append(driver)
+            driver.wait_until_killed()
+
+    fake_browser.hang = hang
+    scraper = HiyaScraper(row_strategy='script', watchdog=Watchdog(deadline=0.5))
+    run = threading.Thread(target=scraper.scrape_all_pages, kwargs={'pipelined': True}, daemon=True)
+    run.start()
+    run.join(timeout=10)
+
+    assert not run.is_alive(), "scrape hung after the prefetched tab stalled"
+    assert stalled and len(fake_browser.drivers) == 2
+    assert scraper.limiter.in_flight == 0
+    assert len(scraper.data) == 4
+    scraper.close()
+
+
+def test_max_pages_caps_a_run_with_known_page_count(page_cache):
+    scraper = HiyaScraper(cache=page_cache, replay=True)
+
+    scraper.scrape_all_pages(max_pages=1)
+
+    assert len(scraper.data) == 3
+    assert not scraper.reached_end
@@ -0,0 +1,56 @@
+import os
+
+import pytest
+
+from conftest import FIXTURES, cache_pages, load_fixture
+from hiya_cache import ResponseCache
+from hiya_scraper import load_row_strategy
+from hiya_selector_bench import _records, load_snapshots, recommend
+
+
+def test_records_keep_only_parseable_rows():
+    header = ['', 'Phone number', 'Submitted']
+    row = ['', '+1 213 731 2373', 'Mar 4, 2024\nops@example.com', 'Spring campaign',
+           'Yes', 'Clean', '', 'Registered']
+
+    records = _records([header, row])
+
+    assert [record['phone_number'] for record in records] == ['+1 213 731 2373']
+
+
+def test_load_snapshots_from_files_and_cache(tmp_path):
+    cache = ResponseCache(str(tmp_path / 'cache'))
+    cache_pages(cache, ['page_roles.html'])
+    cache.put('https://example.com/api', '{}', content_type='application/json')
+
+    snapshots = load_snapshots([os.path.join(FIXTURES, 'page_table.html')], cache.cache_dir)
+
+    assert [name for name, _ in snapshots][0] == 'page_table.html'
+    assert len(snapshots) == 2  # the JSON response is not a page
+    assert snapshots[1][1] == load_fixture('page_roles.html')
+
+
+def test_recommend_fastest_correct_strategy():
+    results = {
+        'auto': {'median_ms': 40.0, 'correct': True, 'rows': 4},
+        'script': {'median_ms': 5.0, 'correct': True, 'rows': 4},
+        'role': {'median_ms': 1.0, 'correct': False, 'rows': 0},
+    }
+
+    assert recommend(results) == 'script'
+    assert recommend({'role': results['role']}) is None
+
+
+@pytest.mark.parametrize('content, expected', [
+    ('{"row_strategy": "script"}', 'script'),
+    ('{"row_strategy": "no-such-strategy"}', 'auto'),
+    ('{"row_strategy": ', 'auto'),
+    ('["script"]', 'auto'),
+    (None, 'auto'),
+])
+def test_load_row_strategy(tmp_path, content, expected):
+    path = tmp_path / 'hiya_selectors.json'
+    if content is not None:
+        path.write_text(content, encoding='utf-8')
+
+    assert load_row_strategy(str(path)) == expected
@@ -0,0 +1,153 @@
+import csv
+
+from conftest import load_fixture, page_url
+from hiya_cache import ResponseCache
+from hiya_driver_pool import DriverPool
+from hiya_scraper import HiyaScraper
+from hiya_shards import ShardQueue, merge_shards, plan_shards, run_worker
+
+
+def write_csv(path, records):
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=list(records[0].keys()))
+        writer.writeheader()
+        writer.writerows(records)
+    return str(path)
+
+
+def test_plan_page_ranges_leave_last_shard_open():
+    shards = plan_shards(statuses=['registered', 'pending'], total_pages=25, pages_per_shard=10)
+
+    assert [(start, end) for _, start, end in shards] == [(0, 10), (10, 20), (20, None)] * 2
+    assert shards[0][0] == {'status': 'registered'}
+
+
+def test_claim_is_exclusive_and_expired_leases_are_reclaimed(tmp_path):
+    queue = ShardQueue(str(tmp_path / 'queue.sqlite'), lease_seconds=60)
+    first = queue.add({}, 0, 10)
+    second = queue.add({}, 10, None)
+
+    assert queue.claim('a')['id'] == first
+    assert queue.claim('b')['id'] == second
+    assert queue.claim('c') is None
+
+    queue.lease_seconds = -1
+    assert queue.renew(first, 'a')  # lease now already expired
+    assert queue.claim('c')['id'] == first
+    assert not queue.renew(first, 'a')
+
+
+def test_expired_lease_on_last_attempt_is_marked_failed(tmp_path):
+    queue = ShardQueue(str(tmp_path / 'queue.sqlite'), lease_seconds=-1, max_attempts=1)
+    shard_id = queue.add({})
+
+    assert queue.claim('a')['id'] == shard_id  # worker 'a' dies holding the lease
+    assert queue.claim('b') is None
+
+    [shard] = queue.shards()
+    assert shard['state'] == 'failed'
+    assert shard['worker'] is None
+
+
+def test_merge_dedupes_and_orders_by_submission(tmp_path):
+    queue = ShardQueue(str(tmp_path / 'queue.sqlite'))
+    registered = queue.add({'status': 'registered'})
+    pending = queue.add({'status': 'pending'})
+    queue.claim('w'), queue.claim('w')
+    queue.complete(registered, 'w', write_csv(tmp_path / 'a.csv', [
+        {'phone_number': '+1 1', 'submitted_date': 'Mar 4, 2024'},
+        {'phone_number': '+1 2', 'submitted_date': 'Mar 1, 2024'},
+    ]), 2)
+    queue.complete(pending, 'w', write_csv(tmp_path / 'b.csv', [
+        {'phone_number': '+1 3', 'submitted_date': 'Mar 3, 2024'},
+        {'phone_number': '+1 2', 'submitted_date': 'Mar 1, 2024'},
+    ]), 2)
+
+    assert merge_shards(queue, str(tmp_path / 'merged.csv')) == 3
+    with open(tmp_path / 'merged.csv', newline='', encoding='utf-8') as f:
+        assert [r['phone_number'] for r in csv.DictReader(f)] == ['+1 1', '+1 3', '+1 2']
+
+
+def test_late_page_range_without_page_count_is_scraped(tmp_path):
+    # Pages 50+ of an account whose pagination text can't be read
+    cache = ResponseCache(str(tmp_path / 'cache'), ttl=None)
+    html = load_fixture('page_table.html').replace('Page 1 of 3 pages', '').replace('203 phone numbers', '')
+    cache.put(page_url(50), html)
+    cache.put(page_url(51), load_fixture('page_empty.html'))
+    queue = ShardQueue(str(tmp_path / 'queue.sqlite'))
+    shard_id = queue.add({}, 50, 60)
+
+    run_worker(queue, str(tmp_path / 'out'), HiyaScraper(cache=cache, replay=True), worker='w')
+
+    [shard] = queue.shards()
+    assert shard['id'] == shard_id and shard['state'] == 'done'
+    assert shard['records'] == 3
+
+
+def test_shard_without_records_or_end_message_is_not_completed(tmp_path):
+    cache = ResponseCache(str(tmp_path / 'cache'), ttl=None)
+    # A table that never rendered rows, and no pagination text
+    for page_num in range(2):
+        cache.put(page_url(page_num), "<html><body><table><tbody></tbody></table></body></html>")
+    queue = ShardQueue(str(tmp_path / 'queue.sqlite'))
+    queue.add({}, 0, 2)
+
+    run_worker(queue, str(tmp_path / 'out'), HiyaScraper(cache=cache, replay=True), worker='w')
+
+    # Released after every attempt, then given up on instead of recorded as empty
+    [shard] = queue.shards()
+    assert shard['state'] == 'failed'
+    assert shard['attempts'] == queue.max_attempts
+    assert shard['output'] is None
+
+
+def test_shard_past_the_last_page_is_done_and_empty(page_cache, tmp_path):
+    queue = ShardQueue(str(tmp_path / 'queue.sqlite'))
+    queue.add({}, 10, None)
+
+    run_worker(queue, str(tmp_path / 'out'), HiyaScraper(cache=page_cache, replay=True), worker='w')
+
+    [shard] = queue.shards()
+    assert shard['state'] == 'done'
+    assert shard['records'] == 0
+
+
+def test_worker_recycles_browser_after_failed_shard(fake_browser, tmp_path):
+    fake_browser.serve(['page_table.html', 'page_roles.html', 'page_empty.html'])
+    queue = ShardQueue(str(tmp_path / 'queue.sqlite'))
+    queue.add({})
+    pool = DriverPool(max_pages=None)
+    scraper = HiyaScraper(pool=pool, row_strategy='script')
+    scraper.driver.service.process.kill()
+
+    assert run_worker(queue, str(tmp_path / 'out'), scraper, worker='w') == 1
+
+    [shard] = queue.shards()
+    assert shard['state'] == 'done' and shard['attempts'] == 2
+    assert shard['records'] == 4
+    assert len(fake_browser.drivers) == 2
+    scraper.close()
+    pool.close()
+
+
+def test_worker_stops_after_consecutive_failures(fake_browser, tmp_path):
+    def hang(driver, call):
+        raise ConnectionError("chromedriver is gone")
+
+    fake_browser.hang = hang
+    queue = ShardQueue(str(tmp_path / 'queue.sqlite'), max_attempts=5)
+    first = queue.add({}, 0, 10)
+    queue.add({}, 10, None)
+    pool = DriverPool(max_pages=None)
+    scraper = HiyaScraper(pool=pool, row_strategy='script')
+
+    assert run_worker(queue, str(tmp_path / 'out'), scraper, worker='w', max_failures=2) == 0
+
+    # The first shard is retried on a fresh browser, then the worker gives up
+    shards = queue.shards()
+    assert shards[0]['id'] == first
+    assert (shards[0]['state'], shards[0]['attempts']) == ('pending', 2)
+    assert shards[1]['attempts'] == 0
+    assert len(fake_browser.drivers) == 2
+    scraper.close()
+    pool.close()